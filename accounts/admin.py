@@ -1,6 +1,8 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from core.paginator import EstimatedCountPaginator
 from .models import User, VendorProfile, OTP
+from .utils import set_vendor_approval
 
 @admin.register(User)
 class CustomUserAdmin(UserAdmin):
@@ -21,16 +23,20 @@ class VendorProfileAdmin(admin.ModelAdmin):
     list_display = ('business_name', 'owner_name', 'user', 'is_approved', 'created_at')
     list_filter = ('is_approved', 'created_at')
     search_fields = ('business_name', 'owner_name', 'user__email')
+    list_select_related = ('user',)
+    autocomplete_fields = ('user',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     actions = ['approve_vendors', 'reject_vendors']
     
     def approve_vendors(self, request, queryset):
-        queryset.update(is_approved=True)
-        self.message_user(request, f'{queryset.count()} vendor(s) approved successfully.')
+        count = set_vendor_approval(queryset, True)
+        self.message_user(request, f'{count} vendor(s) approved successfully.')
     approve_vendors.short_description = 'Approve selected vendors'
     
     def reject_vendors(self, request, queryset):
-        queryset.update(is_approved=False)
-        self.message_user(request, f'{queryset.count()} vendor(s) rejected.')
+        count = set_vendor_approval(queryset, False)
+        self.message_user(request, f'{count} vendor(s) rejected.')
     reject_vendors.short_description = 'Reject selected vendors'
 
 @admin.register(OTP)
@@ -38,4 +44,8 @@ class OTPAdmin(admin.ModelAdmin):
     list_display = ('user', 'otp_code', 'created_at', 'expires_at', 'is_used')
     list_filter = ('is_used', 'created_at')
     search_fields = ('user__email', 'otp_code')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
     readonly_fields = ('created_at', 'expires_at')
\ No newline at end of file
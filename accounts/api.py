@@ -0,0 +1,223 @@
+import base64
+import binascii
+import hashlib
+import json
+from decimal import Decimal
+from functools import wraps
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q, Sum
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.views.decorators.http import require_GET
+
+from core.archive import archived_totals
+from core.models import ArchivedReview, Booking, Package, Review
+from core.reviews import vendor_ratings
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; falls back to the stdlib encoder
+    orjson = None
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+CENTS = Decimal('0.01')
+
+# Public field name -> ORM lookup. Only these can be requested via ?fields=.
+PACKAGE_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'description': 'description',
+    'price': 'price',
+    'is_active': 'is_active',
+    'capacity': 'capacity',
+    'views_count': 'views_count',
+    'booking_count': 'booking_count',
+    'review_count': 'review_count',
+    'rating_sum': 'rating_sum',
+    'popularity': 'popularity',
+    'created_at': 'created_at',
+}
+BOOKING_FIELDS = {
+    'id': 'id',
+    'package': 'package_id',
+    'package_title': 'package__title',
+    'traveler': 'traveler_id',
+    'traveler_email': 'traveler__email',
+    'start_date': 'start_date',
+    'end_date': 'end_date',
+    'status': 'status',
+    'source': 'source',
+    'total_price': 'total_price',
+    'created_at': 'created_at',
+}
+REVIEW_FIELDS = {
+    'id': 'id',
+    'package': 'package_id',
+    'package_title': 'package__title',
+    'traveler': 'traveler_id',
+    'rating': 'rating',
+    'comment': 'comment',
+    'created_at': 'created_at',
+}
+
+
+class ApiError(Exception):
+    pass
+
+
+# Dates, times and decimals go through DjangoJSONEncoder with either encoder,
+# so clients see one format (e.g. "2026-01-02T03:04:05.678Z").
+_default = DjangoJSONEncoder().default
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, default=_default, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(',', ':')).encode()
+
+
+def json_response(request, data, status=200):
+    """Compact JSON with a content ETag, so clients can revalidate offline copies"""
+    content = dumps(data)
+    if status == 200:
+        etag = '"%s"' % hashlib.md5(content, usedforsecurity=False).hexdigest()
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = HttpResponse(content, content_type='application/json')
+        response['ETag'] = etag
+    else:
+        response = HttpResponse(content, content_type='application/json', status=status)
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _requested_fields(request, available):
+    names = [name for name in request.GET.get('fields', '').split(',') if name]
+    if not names:
+        return list(available)
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ApiError(f"Unknown field(s): {', '.join(unknown)}")
+    # The id doubles as the pagination cursor, so it is always returned.
+    return ['id'] + [name for name in dict.fromkeys(names) if name != 'id']
+
+
+def encode_cursor(pk):
+    return base64.urlsafe_b64encode(str(pk).encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    try:
+        return int(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (ValueError, binascii.Error):
+        raise ApiError('Invalid cursor')
+
+
+def _package_filter(request, queryset):
+    package_id = request.GET.get('package')
+    if not package_id:
+        return queryset
+    if not package_id.isdigit():
+        raise ApiError('Invalid package')
+    return queryset.filter(package_id=package_id)
+
+
+def _page_size(request):
+    try:
+        size = int(request.GET.get('limit', DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ApiError('Invalid limit')
+    return min(max(size, 1), MAX_PAGE_SIZE)
+
+
+def paginate(request, queryset, available, *more):
+    """Newest-first keyset page over values_list(); no COUNT and no OFFSET.
+
+    Extra querysets (e.g. an archive table sharing the id space) are paged in
+    the same id order and merged, one query each.
+    """
+    fields = _requested_fields(request, available)
+    limit = _page_size(request)
+    cursor = request.GET.get('cursor')
+    before = decode_cursor(cursor) if cursor else None
+    rows = []
+    for qs in (queryset, *more):
+        if before is not None:
+            qs = qs.filter(pk__lt=before)
+        rows += qs.order_by('-pk').values_list(*(available[name] for name in fields))[:limit + 1]
+    if more:
+        rows.sort(key=lambda row: row[0], reverse=True)
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'results': [dict(zip(fields, row)) for row in rows],
+        'next_cursor': encode_cursor(rows[-1][0]) if has_more else None,
+    }
+
+
+def api_view(view_func):
+    """GET-only JSON view; ApiError becomes a 400 with an error message"""
+
+    @require_GET
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        try:
+            data = view_func(request, *args, **kwargs)
+        except ApiError as exc:
+            return json_response(request, {'error': str(exc)}, status=400)
+        return json_response(request, data)
+
+    return _wrapped_view
+
+
+@api_view
+def packages(request):
+    queryset = Package.objects.filter(vendor=request.user)
+    if request.GET.get('active') in ('0', '1'):
+        queryset = queryset.filter(is_active=request.GET['active'] == '1')
+    return paginate(request, queryset, PACKAGE_FIELDS)
+
+
+@api_view
+def bookings(request):
+    queryset = Booking.objects.filter(package__vendor=request.user)
+    if request.GET.get('status'):
+        queryset = queryset.filter(status=request.GET['status'])
+    return paginate(request, _package_filter(request, queryset), BOOKING_FIELDS)
+
+
+@api_view
+def reviews(request):
+    # Archived reviews keep their ids and still count in the ratings, so they are listed too.
+    queryset = Review.objects.filter(package__vendor=request.user)
+    archived = ArchivedReview.objects.filter(package__vendor=request.user)
+    return paginate(
+        request, _package_filter(request, queryset), REVIEW_FIELDS, _package_filter(request, archived),
+    )
+
+
+@api_view
+def stats(request):
+    packages = Package.objects.filter(vendor=request.user).aggregate(
+        total=Count('id'),
+        active=Count('id', filter=Q(is_active=True)),
+    )
+    bookings = Booking.objects.filter(package__vendor=request.user).aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='pending')),
+        revenue=Sum('total_price', filter=Q(status='confirmed')),
+    )
+    archived_bookings, archived_revenue = archived_totals(request.user)
+    ratings = vendor_ratings(request.user)
+    return {
+        'total_packages': packages['total'],
+        'active_packages': packages['active'],
+        'total_bookings': bookings['total'] + archived_bookings,
+        'pending_bookings': bookings['pending'],
+        # Always two decimal places, even with no bookings at all.
+        'total_revenue': ((bookings['revenue'] or 0) + archived_revenue).quantize(CENTS),
+        'review_count': ratings['count'],
+        'average_rating': round(ratings['avg'], 2),
+    }
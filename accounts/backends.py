@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from .models import User
+
+
+def user_cache_key(user_id):
+    return f'accounts:user:{user_id}'
+
+
+def invalidate_cached_user(*user_ids):
+    cache.delete_many([user_cache_key(user_id) for user_id in user_ids])
+
+
+class CachedModelBackend(ModelBackend):
+    """ModelBackend whose per-request user lookup is served from the cache.
+
+    The user is loaded together with its vendor profile in one select_related
+    query, so `request.user.vendor_profile` costs nothing afterwards. Entries
+    are dropped by accounts.signals whenever the user or profile is saved.
+
+    The cached row carries the password hash and is_active, and invalidation
+    only reaches the cache it runs against, so caching is limited to a shared
+    cache (settings.SHARED_CACHE). With a process-local cache every request
+    loads the user, still together with its profile, from the database.
+    """
+
+    def _load_user(self, user_id):
+        return User._default_manager.select_related('vendor_profile').filter(pk=user_id).first()
+
+    def get_user(self, user_id):
+        if not getattr(settings, 'SHARED_CACHE', False):
+            user = self._load_user(user_id)
+            return user if user is not None and self.user_can_authenticate(user) else None
+
+        key = user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            user = self._load_user(user_id)
+            if user is None:
+                return None
+            cache.set(key, user, getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', 300))
+        return user if self.user_can_authenticate(user) else None
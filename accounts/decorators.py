@@ -0,0 +1,82 @@
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.auth.views import redirect_to_login
+from django.core import signing
+from django.http import JsonResponse
+from django.urls import URLPattern, URLResolver
+
+ROLE_CLAIM_SESSION_KEY = '_role_claim'
+ROLE_CLAIM_SALT = 'accounts.role-claim'
+
+
+def issue_role_claim(request, user):
+    """Store a signed {uid, role} claim in the session at login"""
+    request.session[ROLE_CLAIM_SESSION_KEY] = signing.dumps(
+        {'uid': str(user.pk), 'role': user.user_type},
+        salt=ROLE_CLAIM_SALT,
+    )
+
+
+def session_role(request):
+    """Role of the logged-in user, read from the session claim only (no DB)"""
+    token = request.session.get(ROLE_CLAIM_SESSION_KEY)
+    user_id = request.session.get(SESSION_KEY)
+    if not token or user_id is None:
+        return None
+    try:
+        claim = signing.loads(token, salt=ROLE_CLAIM_SALT, max_age=settings.SESSION_COOKIE_AGE)
+    except signing.BadSignature:
+        return None
+    if claim.get('uid') != str(user_id):
+        return None
+    return claim.get('role')
+
+
+def is_vendor_request(request):
+    """
+    True if the request belongs to a vendor.
+
+    The session claim only lets anonymous users and non-vendors be turned away
+    without loading the user; a passing claim is confirmed against the loaded
+    user so a demoted vendor loses access straight away.
+    """
+    if session_role(request) != 'vendor':
+        return False
+    user = request.user
+    return user.is_authenticated and user.user_type == 'vendor'
+
+
+def vendor_required(view_func):
+    """Allow only vendors; claim rejections never touch the DB or the messages framework"""
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not is_vendor_request(request):
+            return redirect_to_login(request.get_full_path(), 'vendor_login')
+        return view_func(request, *args, **kwargs)
+
+    return _wrapped_view
+
+
+def vendor_api_required(view_func):
+    """vendor_required for JSON endpoints: a 401 body instead of a login redirect"""
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        if not is_vendor_request(request):
+            return JsonResponse({'error': 'Vendor login required'}, status=401)
+        return view_func(request, *args, **kwargs)
+
+    return _wrapped_view
+
+
+def guard_urlpatterns(urlpatterns, decorator):
+    """Apply a view decorator to every route in a urlpatterns list, recursively"""
+    for pattern in urlpatterns:
+        if isinstance(pattern, URLPattern):
+            pattern.callback = decorator(pattern.callback)
+        elif isinstance(pattern, URLResolver):
+            guard_urlpatterns(pattern.url_patterns, decorator)
+    return urlpatterns
@@ -0,0 +1,39 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import VendorProfile
+from accounts.utils import set_vendor_approval
+from core.background import worker
+
+
+class Command(BaseCommand):
+    help = 'Approve or reject vendor profiles in batches and notify vendors by email.'
+
+    def add_arguments(self, parser):
+        decision = parser.add_mutually_exclusive_group(required=True)
+        decision.add_argument('--approve', action='store_true')
+        decision.add_argument('--reject', action='store_true')
+        parser.add_argument('--ids', nargs='+', type=int, help='Vendor profile IDs to moderate.')
+        parser.add_argument('--all-pending', action='store_true', help='Moderate every unapproved vendor.')
+        parser.add_argument('--batch-size', type=int, default=500)
+        parser.add_argument('--no-email', action='store_true', help='Do not notify vendors.')
+
+    def handle(self, *args, **options):
+        if options['ids']:
+            queryset = VendorProfile.objects.filter(pk__in=options['ids'])
+        elif options['all_pending']:
+            queryset = VendorProfile.objects.filter(is_approved=False)
+        else:
+            raise CommandError('Pass --ids or --all-pending.')
+
+        approved = options['approve']
+        count = set_vendor_approval(
+            queryset,
+            approved,
+            batch_size=options['batch_size'],
+            notify=not options['no_email'],
+        )
+        # Emails go out on a daemon thread; let it drain before the process exits.
+        worker.join()
+
+        action = 'approved' if approved else 'rejected'
+        self.stdout.write(self.style.SUCCESS(f'{count} vendor(s) {action}.'))
@@ -22,18 +22,27 @@ class VendorProfile(models.Model):
     business_name = models.CharField(max_length=255)
     owner_name = models.CharField(max_length=255)
     business_license = models.FileField(upload_to='licenses/', blank=True, null=True)
-    is_approved = models.BooleanField(default=False)
-    created_at = models.DateTimeField(auto_now_add=True)
+    is_approved = models.BooleanField(default=False, db_index=True)
+    # Running totals across all of the vendor's packages, kept by core.signals.
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     
     def __str__(self):
         return self.business_name
+    
+    @property
+    def avg_rating(self):
+        if not self.review_count:
+            return 0
+        return self.rating_sum / self.review_count
 
 class OTP(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE)
     otp_code = models.CharField(max_length=6)
-    created_at = models.DateTimeField(auto_now_add=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
     expires_at = models.DateTimeField()
-    is_used = models.BooleanField(default=False)
+    is_used = models.BooleanField(default=False, db_index=True)
     
     def save(self, *args, **kwargs):
         if not self.expires_at:
@@ -1,3 +1,311 @@
-from django.test import TestCase
+from datetime import date, timedelta
+import hashlib
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.storage import InMemoryStorage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from core.archive import archive_bookings, archive_reviews
+from core.models import Booking, Package, Review
+
+from .backends import CachedModelBackend, user_cache_key
+from .models import User, VendorProfile
+from .urls import vendor_api_patterns, vendor_portal_patterns
+from .uploads import UploadRejected, store_license
+from .utils import send_vendor_status_emails, set_vendor_approval
+
+
+class VendorApprovalTests(TestCase):
+    def make_vendor(self, name, approved=False):
+        user = User.objects.create_user(
+            username=name, email=f'{name}@example.com', password='secret', user_type='vendor',
+        )
+        return VendorProfile.objects.create(
+            user=user, business_name=name, owner_name=name, is_approved=approved,
+        )
+
+    @override_settings(BACKGROUND_TASKS_EAGER=True)
+    def test_only_changed_vendors_are_updated_and_notified(self):
+        pending = [self.make_vendor('alpha'), self.make_vendor('bravo')]
+        self.make_vendor('charlie', approved=True)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            changed = set_vendor_approval(VendorProfile.objects.all(), True)
+
+        self.assertEqual(changed, 2)
+        self.assertEqual(
+            sorted(message.to[0] for message in mail.outbox),
+            sorted(profile.user.email for profile in pending),
+        )
+
+    def test_send_failures_are_logged(self):
+        with mock.patch('accounts.utils.send_mass_mail', side_effect=OSError('down')), \
+                self.assertLogs('accounts.utils', 'ERROR'):
+            self.assertEqual(send_vendor_status_emails(['alpha@example.com'], True), 0)
+
+
+class VendorGuardTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = User.objects.create_user(
+            username='vendor', email='vendor@example.com', password='secret', user_type='vendor',
+        )
+        VendorProfile.objects.create(user=cls.vendor, business_name='Treks', owner_name='Owner')
+        cls.traveler = User.objects.create_user(
+            username='traveler', email='traveler@example.com', password='secret', user_type='traveler',
+        )
+
+    def get(self, name):
+        return self.client.get(reverse(name))
+
+    def test_anonymous_is_redirected_to_vendor_login(self):
+        response = self.get('vendor_dashboard')
+
+        self.assertRedirects(
+            response, f"{reverse('vendor_login')}?next={reverse('vendor_dashboard')}",
+            fetch_redirect_response=False,
+        )
+        self.assertEqual(self.get('vendor_api_stats').status_code, 401)
+
+    def test_every_vendor_route_is_guarded(self):
+        guarded = [(p, 302) for p in vendor_portal_patterns] + [(p, 401) for p in vendor_api_patterns]
+        for pattern, status in guarded:
+            url = reverse(pattern.name, kwargs={name: 1 for name in pattern.pattern.converters})
+            with self.subTest(url=url):
+                self.assertEqual(self.client.get(url).status_code, status)
+
+    def test_traveler_is_turned_away_without_a_user_lookup(self):
+        self.client.force_login(self.traveler)
+
+        with self.assertNumQueries(1):  # the session row only
+            self.assertEqual(self.get('vendor_dashboard').status_code, 302)
+        self.assertEqual(self.get('vendor_api_stats').status_code, 401)
+
+    def test_vendor_is_let_through(self):
+        self.client.force_login(self.vendor)
+
+        self.assertEqual(self.get('vendor_dashboard').status_code, 200)
+        self.assertEqual(self.get('vendor_api_stats').status_code, 200)
+
+    def test_demoted_vendor_loses_access(self):
+        self.client.force_login(self.vendor)
+        self.vendor.user_type = 'traveler'
+        self.vendor.save()
+
+        self.assertEqual(self.get('vendor_dashboard').status_code, 302)
+        self.assertEqual(self.get('vendor_api_stats').status_code, 401)
+
+
+class VendorArchiveViewTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = User.objects.create_user(
+            username='vendor', email='vendor@example.com', password='secret', user_type='vendor',
+        )
+        VendorProfile.objects.create(user=cls.vendor, business_name='Treks', owner_name='Owner')
+        traveler = User.objects.create_user(
+            username='traveler', email='traveler@example.com', password='secret', user_type='traveler',
+        )
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='secret', user_type='traveler',
+        )
+        package = Package.objects.create(vendor=cls.vendor, title='Annapurna Base Camp', price=100)
+        long_ago = timezone.now() - timedelta(days=800)
+        Booking.objects.create(
+            package=package, traveler=traveler, total_price=100, source='partner',
+            start_date=long_ago.date(), end_date=long_ago.date(),
+        )
+        Booking.objects.create(
+            package=package, traveler=traveler, total_price=100, source='direct',
+            start_date=date(2030, 5, 1), end_date=date(2030, 5, 2),
+        )
+        cls.old_review = Review.objects.create(package=package, traveler=traveler, rating=2, comment='Old trip')
+        Review.objects.update(created_at=long_ago)
+        cls.new_review = Review.objects.create(package=package, traveler=other, rating=5, comment='New trip')
+        archive_bookings()
+        archive_reviews()
+
+    def setUp(self):
+        self.client.force_login(self.vendor)
+
+    def test_reviews_page_lists_archived_reviews(self):
+        response = self.client.get(reverse('vendor_reviews'))
+
+        self.assertEqual(
+            [review.pk for review in response.context['reviews']], [self.new_review.pk, self.old_review.pk],
+        )
+        self.assertContains(response, 'Old trip')
+
+    def test_reviews_api_pages_through_archived_reviews(self):
+        first = self.client.get(reverse('vendor_api_reviews'), {'limit': 1, 'fields': 'rating'}).json()
+        second = self.client.get(
+            reverse('vendor_api_reviews'), {'limit': 1, 'fields': 'rating', 'cursor': first['next_cursor']},
+        ).json()
+
+        self.assertEqual(first['results'], [{'id': self.new_review.pk, 'rating': 5}])
+        self.assertEqual(second, {'results': [{'id': self.old_review.pk, 'rating': 2}], 'next_cursor': None})
+
+    def test_dashboard_source_breakdown_matches_total_bookings(self):
+        context = self.client.get(reverse('vendor_dashboard')).context
+        counts = {row['key']: row['count'] for row in context['source_breakdown']}
+
+        self.assertEqual(context['stats']['total_bookings'], 2)
+        self.assertEqual((counts['direct'], counts['partner']), (1, 1))
+
+
+class VendorApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = User.objects.create_user(
+            username='vendor', email='vendor@example.com', password='secret', user_type='vendor',
+        )
+        cls.packages = [
+            Package.objects.create(vendor=cls.vendor, title=f'Trek {n}', price=100 + n) for n in range(5)
+        ]
+        other = User.objects.create_user(
+            username='other', email='other@example.com', password='secret', user_type='vendor',
+        )
+        Package.objects.create(vendor=other, title='Not ours', price=1)
+
+    def setUp(self):
+        self.client.force_login(self.vendor)
+
+    def get(self, name, **params):
+        return self.client.get(reverse(name), params)
+
+    def test_sparse_fields_always_include_the_id(self):
+        response = self.get('vendor_api_packages', fields='title,price', limit=1)
+
+        self.assertEqual(
+            response.json()['results'], [{'id': self.packages[-1].pk, 'title': 'Trek 4', 'price': '104.00'}],
+        )
+
+    def test_unknown_field_is_a_bad_request(self):
+        response = self.get('vendor_api_packages', fields='title,password')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'error': 'Unknown field(s): password'})
+
+    def test_cursor_walks_every_own_package_once(self):
+        seen, params = [], {'fields': 'id', 'limit': 2}
+        while True:
+            page = self.get('vendor_api_packages', **params).json()
+            seen += [row['id'] for row in page['results']]
+            if page['next_cursor'] is None:
+                break
+            params['cursor'] = page['next_cursor']
+
+        self.assertEqual(seen, [package.pk for package in reversed(self.packages)])
+
+    def test_invalid_limit_cursor_and_package_are_rejected(self):
+        for params in ({'limit': 'ten'}, {'cursor': '!!'}, {'package': 'x'}):
+            with self.subTest(params=params):
+                self.assertEqual(self.get('vendor_api_bookings', **params).status_code, 400)
+
+    def test_limit_is_clamped(self):
+        self.assertEqual(len(self.get('vendor_api_packages', limit=0).json()['results']), 1)
+        self.assertEqual(len(self.get('vendor_api_packages', limit=10 ** 6).json()['results']), 5)
+
+    def test_anonymous_gets_a_json_401(self):
+        self.client.logout()
+
+        response = self.get('vendor_api_packages')
+
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json(), {'error': 'Vendor login required'})
+
+    def test_unchanged_response_revalidates_to_304(self):
+        response = self.get('vendor_api_stats')
+
+        again = self.client.get(reverse('vendor_api_stats'), HTTP_IF_NONE_MATCH=response['ETag'])
+
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.content, b'')
+
+    def test_revenue_always_has_two_decimal_places(self):
+        self.assertEqual(self.get('vendor_api_stats').json()['total_revenue'], '0.00')
+
+        Booking.objects.create(
+            package=self.packages[0], total_price=123, status='confirmed',
+            start_date=date(2030, 5, 1), end_date=date(2030, 5, 2),
+        )
+
+        self.assertEqual(self.get('vendor_api_stats').json()['total_revenue'], '123.00')
+
+
+class CachedModelBackendTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = User.objects.create_user(
+            username='vendor', email='vendor@example.com', password='secret', user_type='vendor',
+        )
+        VendorProfile.objects.create(user=cls.vendor, business_name='Treks', owner_name='Owner')
+
+    def setUp(self):
+        cache.clear()
+        self.backend = CachedModelBackend()
+
+    @override_settings(SHARED_CACHE=True)
+    def test_shared_cache_serves_repeat_lookups_until_the_user_changes(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.backend.get_user(self.vendor.pk).vendor_profile.business_name, 'Treks')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.backend.get_user(self.vendor.pk), self.vendor)
+
+        self.vendor.is_active = False
+        self.vendor.save()
+
+        self.assertIsNone(self.backend.get_user(self.vendor.pk))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_process_local_cache_always_reads_the_database(self):
+        for _ in range(2):
+            with self.assertNumQueries(1):
+                self.assertEqual(self.backend.get_user(self.vendor.pk).vendor_profile.business_name, 'Treks')
+        self.assertIsNone(cache.get(user_cache_key(self.vendor.pk)))
+
+
+class LicenseUploadTests(TestCase):
+    def setUp(self):
+        self.storage = InMemoryStorage()
+
+    def test_identical_files_are_stored_and_processed_once(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            first = store_license(SimpleUploadedFile('license.pdf', b'%PDF-1.4 licence'), self.storage)
+            second = store_license(SimpleUploadedFile('copy.PDF', b'%PDF-1.4 licence'), self.storage)
+
+        self.assertEqual(first, second)
+        self.assertRegex(first, r'^licenses/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.pdf$')
+        self.assertEqual(len(callbacks), 1)
+        with self.storage.open(first) as fh:
+            self.assertEqual(fh.read(), b'%PDF-1.4 licence')
+
+    def upload(self, content):
+        return RequestFactory().post('/', {'business_license': SimpleUploadedFile('license.pdf', content)})
+
+    def test_upload_handler_hashes_while_streaming(self):
+        request = self.upload(b'%PDF-1.4 licence')
+
+        self.assertEqual(request.FILES['business_license'].sha256, hashlib.sha256(b'%PDF-1.4 licence').hexdigest())
+
+    @override_settings(FILE_UPLOAD_MAX_BYTES=4)
+    def test_upload_handler_skips_oversized_files(self):
+        request = self.upload(b'12345')
+
+        self.assertNotIn('business_license', request.FILES)
+        self.assertEqual(request.upload_errors, {'business_license': 'File is too large.'})
+
+    def test_disallowed_extension_is_rejected_before_storing(self):
+        with self.assertRaisesMessage(UploadRejected, 'PDF, JPG or PNG'):
+            store_license(SimpleUploadedFile('license.exe', b'MZ'), self.storage)
+        self.assertEqual(self.storage.listdir('')[1], [])
+
+    @override_settings(FILE_UPLOAD_MAX_BYTES=4)
+    def test_oversized_file_is_rejected(self):
+        with self.assertRaisesMessage(UploadRejected, 'too large'):
+            store_license(SimpleUploadedFile('license.png', b'12345'), self.storage)
@@ -0,0 +1,146 @@
+import hashlib
+import io
+import logging
+import os
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.core.files.uploadhandler import SkipFile, TemporaryFileUploadHandler
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from core.background import worker
+
+logger = logging.getLogger(__name__)
+
+LICENSE_EXTENSIONS = {'.pdf', '.jpg', '.jpeg', '.png'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png'}
+PREVIEW_SIZE = (400, 400)
+
+
+class UploadRejected(Exception):
+    """Raised when an uploaded file fails validation"""
+
+
+class HashingFileUploadHandler(TemporaryFileUploadHandler):
+    """Stream uploads to a temp file while hashing them and enforcing a size cap.
+
+    Memory use stays at one chunk per upload. Oversized files are skipped and
+    reported on `request.upload_errors` so views can show a proper message.
+    """
+
+    def new_file(self, field_name, *args, **kwargs):
+        super().new_file(field_name, *args, **kwargs)
+        self.sha256 = hashlib.sha256()
+        self.received = 0
+
+    def receive_data_chunk(self, raw_data, start):
+        self.received += len(raw_data)
+        if self.received > settings.FILE_UPLOAD_MAX_BYTES:
+            self.file.close()
+            errors = getattr(self.request, 'upload_errors', {})
+            errors[self.field_name] = 'File is too large.'
+            self.request.upload_errors = errors
+            raise SkipFile()
+        self.sha256.update(raw_data)
+        return super().receive_data_chunk(raw_data, start)
+
+    def file_complete(self, file_size):
+        uploaded = super().file_complete(file_size)
+        uploaded.sha256 = self.sha256.hexdigest()
+        return uploaded
+
+
+def content_hash(uploaded_file):
+    digest = getattr(uploaded_file, 'sha256', None)
+    if digest:
+        return digest
+    sha256 = hashlib.sha256()
+    for chunk in uploaded_file.chunks():
+        sha256.update(chunk)
+    uploaded_file.seek(0)
+    return sha256.hexdigest()
+
+
+def validate_license(uploaded_file):
+    extension = os.path.splitext(uploaded_file.name)[1].lower()
+    if extension not in LICENSE_EXTENSIONS:
+        raise UploadRejected('Business license must be a PDF, JPG or PNG file.')
+    if uploaded_file.size > settings.FILE_UPLOAD_MAX_BYTES:
+        raise UploadRejected('Business license file is too large.')
+    return extension
+
+
+def store_license(uploaded_file, storage=None):
+    """Save a license under a content-addressed path and return its storage name.
+
+    Identical files map to the same name, so re-uploads are stored once and
+    post-processed once.
+    """
+    storage = storage or default_storage
+    extension = validate_license(uploaded_file)
+    digest = content_hash(uploaded_file)
+    name = f'licenses/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+    if not storage.exists(name):
+        name = storage.save(name, uploaded_file)
+        transaction.on_commit(lambda: worker.enqueue(process_license, name, storage))
+    return name
+
+
+def process_license(name, storage=None):
+    """Run every configured post-processor on a stored license"""
+    storage = storage or default_storage
+    for path in settings.LICENSE_POSTPROCESSORS:
+        if import_string(path)(storage, name) is False:
+            logger.warning('License %s rejected by %s', name, path)
+            break
+
+
+def scan_license(storage, name):
+    """Virus-scan hook; returns False (and quarantines the file) on a hit"""
+    scanner_path = getattr(settings, 'LICENSE_VIRUS_SCANNER', None)
+    if not scanner_path:
+        return True
+    with storage.open(name, 'rb') as fh:
+        clean = import_string(scanner_path)(fh)
+    if not clean:
+        from .models import VendorProfile
+
+        VendorProfile.objects.filter(business_license=name).update(business_license=None)
+        storage.delete(name)
+    return clean
+
+
+def preview_name(name):
+    return f'licenses/previews/{os.path.splitext(os.path.basename(name))[0]}.png'
+
+
+def make_license_preview(storage, name):
+    """Render a PNG thumbnail (first page for PDFs) if the optional libs exist"""
+    try:
+        from PIL import Image
+    except ImportError:
+        return True
+
+    extension = os.path.splitext(name)[1].lower()
+    with storage.open(name, 'rb') as fh:
+        if extension in IMAGE_EXTENSIONS:
+            image = Image.open(fh)
+            image.load()
+        else:
+            try:
+                import pypdfium2
+            except ImportError:
+                return True
+            page = pypdfium2.PdfDocument(fh.read())[0]
+            image = page.render(scale=1).to_pil()
+
+    image.thumbnail(PREVIEW_SIZE)
+    buffer = io.BytesIO()
+    image.convert('RGB').save(buffer, format='PNG')
+    target = preview_name(name)
+    if not storage.exists(target):
+        storage.save(target, ContentFile(buffer.getvalue()))
+    return True
@@ -1,5 +1,27 @@
-from django.urls import path
-from . import views
+from django.urls import include, path
+from . import api, views
+from .decorators import guard_urlpatterns, vendor_api_required, vendor_required
+
+# Everything under vendor/ except login/register; guarded here rather than per view.
+vendor_portal_patterns = [
+    path('dashboard/', views.vendor_dashboard, name='vendor_dashboard'),
+    path('packages/', views.vendor_packages, name='vendor_packages'),
+    path('bookings/', views.vendor_bookings, name='vendor_bookings'),
+    path('bookings/bulk/', views.vendor_bookings_bulk, name='vendor_bookings_bulk'),
+    path('bookings/<int:pk>/status/', views.vendor_booking_status, name='vendor_booking_status'),
+    path('reviews/', views.vendor_reviews, name='vendor_reviews'),
+    path('analytics/', views.vendor_analytics, name='vendor_analytics'),
+    path('settings/', views.vendor_settings, name='vendor_settings'),
+    path('settings/calendar/reset/', views.vendor_calendar_reset, name='vendor_calendar_reset'),
+]
+
+# Read-only JSON counterparts of the portal pages for mobile/SPA clients.
+vendor_api_patterns = [
+    path('packages/', api.packages, name='vendor_api_packages'),
+    path('bookings/', api.bookings, name='vendor_api_bookings'),
+    path('reviews/', api.reviews, name='vendor_api_reviews'),
+    path('stats/', api.stats, name='vendor_api_stats'),
+]
 
 urlpatterns = [
     path('traveler/login/', views.traveler_login, name='traveler_login'),
@@ -7,12 +29,8 @@ urlpatterns = [
 
     path('vendor/login/', views.vendor_login, name='vendor_login'),
     path('vendor/register/', views.vendor_register, name='vendor_register'),
-    path('vendor/dashboard/', views.vendor_dashboard, name='vendor_dashboard'),
-    path('vendor/packages/', views.vendor_packages, name='vendor_packages'),
-    path('vendor/bookings/', views.vendor_bookings, name='vendor_bookings'),
-    path('vendor/reviews/', views.vendor_reviews, name='vendor_reviews'),
-    path('vendor/analytics/', views.vendor_analytics, name='vendor_analytics'),
-    path('vendor/settings/', views.vendor_settings, name='vendor_settings'),
+    path('vendor/api/', include(guard_urlpatterns(vendor_api_patterns, vendor_api_required))),
+    path('vendor/', include(guard_urlpatterns(vendor_portal_patterns, vendor_required))),
     
     path('admin/login/', views.admin_login, name='admin_login'),
 
@@ -1,8 +1,14 @@
 
+import logging
 import random
-from django.core.mail import send_mail
+from django.core.mail import send_mail, send_mass_mail
 from django.conf import settings
-from .models import OTP
+from django.db import transaction
+from core.background import worker
+from .backends import invalidate_cached_user
+from .models import OTP, VendorProfile
+
+logger = logging.getLogger(__name__)
 
 def generate_otp():
     """Generate a 6-digit OTP"""
@@ -46,4 +52,61 @@ def verify_otp(user, otp_code):
             return True
         return False
     except OTP.DoesNotExist:
-        return False
\ No newline at end of file
+        return False
+
+def send_vendor_status_emails(emails, approved):
+    """Notify vendors about a moderation decision over one SMTP connection"""
+    if approved:
+        subject = 'Your vendor account has been approved'
+        message = 'Good news! Your Namaste Nomad vendor account is approved. You can now publish packages.'
+    else:
+        subject = 'Your vendor account was not approved'
+        message = 'Your Namaste Nomad vendor account is not approved at this time. Please contact support for details.'
+    from_email = settings.DEFAULT_FROM_EMAIL
+    messages = [(subject, message, from_email, [email]) for email in emails if email]
+
+    try:
+        return send_mass_mail(messages)
+    except Exception:
+        logger.exception('Could not send %d vendor status email(s)', len(messages))
+        return 0
+
+def set_vendor_approval(queryset, approved, batch_size=500, notify=True):
+    """Approve or reject vendor profiles in batches.
+
+    Only profiles whose status actually changes are updated and notified.
+    Returns the number of profiles changed, taken from the UPDATE row counts.
+    """
+    changing = queryset.exclude(is_approved=approved).order_by('pk')
+    total = 0
+    last_pk = 0
+
+    while True:
+        batch = list(
+            changing.filter(pk__gt=last_pk).values_list('pk', 'user_id', 'user__email')[:batch_size]
+        )
+        if not batch:
+            break
+        last_pk = batch[-1][0]
+        pks = [pk for pk, _, _ in batch]
+
+        with transaction.atomic():
+            # Lock the rows still needing the change, so the ones notified
+            # are exactly the ones this UPDATE changes (not those a
+            # concurrent moderator got to first).
+            changed = set(
+                VendorProfile.objects.select_for_update()
+                .filter(pk__in=pks)
+                .exclude(is_approved=approved)
+                .values_list('pk', flat=True)
+            )
+            updated = VendorProfile.objects.filter(pk__in=changed).update(is_approved=approved)
+        total += updated
+        # update() skips post_save, so drop the cached users by hand.
+        invalidate_cached_user(*[user_id for pk, user_id, _ in batch if pk in changed])
+
+        if notify and updated:
+            emails = [email for pk, _, email in batch if pk in changed]
+            transaction.on_commit(lambda emails=emails: worker.enqueue(send_vendor_status_emails, emails, approved))
+
+    return total
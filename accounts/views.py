@@ -1,17 +1,26 @@
-from datetime import timedelta
+from datetime import date, timedelta
 
 from django.contrib import messages
 from django.contrib.auth import authenticate, login, logout
-from django.contrib.auth.decorators import login_required
-from django.db.models import Avg, Count, Sum
-from django.shortcuts import redirect, render
+from django.db.models import Count, Sum
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import reverse
 from django.utils import timezone
 from django.views.decorators.csrf import csrf_protect
-
-from core.models import Booking, Package, Review
+from django.views.decorators.http import require_POST
+
+from core.archive import archived_source_counts, archived_totals, booking_history, review_history
+from core.bookings import InvalidTransition, bulk_transition, transition
+from core.calendar import feed_token, rotate_feed_token
+from core.models import Booking, Package
+from core.popularity import top_packages
+from core.reviews import vendor_ratings
 from .models import User, VendorProfile
+from .uploads import UploadRejected, store_license, validate_license
 from .utils import create_otp, verify_otp as verify_otp_util
 
+HISTORY_LIMIT = 50
+
 
 def _get_vendor_profile(user):
     try:
@@ -20,31 +29,27 @@ def _get_vendor_profile(user):
         return None
 
 
-def _ensure_vendor(request):
-    if getattr(request.user, 'user_type', '') != 'vendor':
-        messages.error(request, 'Vendor access only.')
-        return False
-    return True
+def _parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
 
 
-@login_required(login_url='vendor_login')
 def vendor_dashboard(request):
-    if not _ensure_vendor(request):
-        return redirect('vendor_login')
-
     vendor_profile = _get_vendor_profile(request.user)
     vendor_packages = Package.objects.filter(vendor=request.user)
     vendor_bookings = Booking.objects.filter(package__vendor=request.user)
 
-    total_revenue = vendor_bookings.filter(status='confirmed').aggregate(
+    archived_bookings, archived_revenue = archived_totals(request.user)
+    total_revenue = (vendor_bookings.filter(status='confirmed').aggregate(
         total=Sum('total_price')
-    )['total'] or 0
+    )['total'] or 0) + archived_revenue
     active_packages = vendor_packages.filter(is_active=True).count()
-    total_bookings = vendor_bookings.count()
+    total_bookings = vendor_bookings.count() + archived_bookings
     pending_bookings = vendor_bookings.filter(status='pending').count()
-    average_rating = Review.objects.filter(package__vendor=request.user).aggregate(
-        avg=Avg('rating')
-    )['avg'] or 0
+    ratings = vendor_ratings(request.user)
+    average_rating = ratings['avg']
 
     today = timezone.now().date()
     weekly_revenue = []
@@ -104,9 +109,12 @@ def vendor_dashboard(request):
         line_points.append(f"{x:.0f},{y:.0f}")
     line_points_str = " ".join(line_points)
 
+    # Archived bookings count towards their source too, matching total_bookings.
     source_totals = {key: 0 for key, _ in Booking.SOURCE_CHOICES}
+    for source, count in archived_source_counts(request.user).items():
+        source_totals[source] += count
     for row in vendor_bookings.values('source').annotate(count=Count('id')):
-        source_totals[row['source']] = row['count']
+        source_totals[row['source']] += row['count']
 
     total_sources = sum(source_totals.values())
     source_order = ['direct', 'partner', 'social', 'marketplace']
@@ -145,12 +153,9 @@ def vendor_dashboard(request):
     upcoming_bookings = vendor_bookings.filter(
         start_date__gte=today,
         start_date__lte=today + timedelta(days=14),
-    ).exclude(status='cancelled').order_by('start_date')[:3]
+    ).exclude(status='cancelled').select_related('package', 'traveler').order_by('start_date')[:3]
 
-    package_performance = vendor_packages.annotate(
-        booking_count=Count('bookings'),
-        avg_rating=Avg('reviews__rating'),
-    ).order_by('-booking_count', '-views_count')[:3]
+    package_performance = top_packages(limit=3, vendor=request.user, include_inactive=True)
 
     return render(request, 'accounts/vendor_dashboard.html', {
         'vendor_profile': vendor_profile,
@@ -172,15 +177,9 @@ def vendor_dashboard(request):
     })
 
 
-@login_required(login_url='vendor_login')
 def vendor_packages(request):
-    if not _ensure_vendor(request):
-        return redirect('vendor_login')
-
     vendor_profile = _get_vendor_profile(request.user)
-    packages = Package.objects.filter(vendor=request.user).annotate(
-        booking_count=Count('bookings'),
-    ).order_by('-created_at')
+    packages = Package.objects.filter(vendor=request.user).order_by('-created_at')
     return render(request, 'accounts/vendor_packages.html', {
         'vendor_profile': vendor_profile,
         'active_page': 'packages',
@@ -188,13 +187,11 @@ def vendor_packages(request):
     })
 
 
-@login_required(login_url='vendor_login')
 def vendor_bookings(request):
-    if not _ensure_vendor(request):
-        return redirect('vendor_login')
-
     vendor_profile = _get_vendor_profile(request.user)
-    bookings = Booking.objects.filter(package__vendor=request.user).order_by('-created_at')
+    bookings = Booking.objects.filter(package__vendor=request.user).select_related(
+        'package', 'traveler',
+    ).order_by('-created_at')
     return render(request, 'accounts/vendor_bookings.html', {
         'vendor_profile': vendor_profile,
         'active_page': 'bookings',
@@ -202,13 +199,41 @@ def vendor_bookings(request):
     })
 
 
-@login_required(login_url='vendor_login')
-def vendor_reviews(request):
-    if not _ensure_vendor(request):
-        return redirect('vendor_login')
+@require_POST
+def vendor_bookings_bulk(request):
+    action = request.POST.get('action')
+    to_status = {'confirm': 'confirmed', 'cancel': 'cancelled'}.get(action)
+    if to_status is None:
+        messages.error(request, 'Unknown booking action.')
+        return redirect('vendor_bookings')
+
+    booking_ids = [pk for pk in request.POST.getlist('booking_ids') if pk.isdigit()]
+    count = bulk_transition(request.user, booking_ids, to_status)
+    messages.success(request, f'{count} booking(s) {to_status}.')
+    return redirect('vendor_bookings')
 
+
+@require_POST
+def vendor_booking_status(request, pk):
+    booking = get_object_or_404(Booking, pk=pk, package__vendor=request.user)
+    to_status = request.POST.get('status')
+    try:
+        # `expected` is the status the vendor saw, so a booking someone else
+        # changed in the meantime is left alone rather than overwritten.
+        moved = transition(booking, to_status, expected=request.POST.get('expected'))
+    except InvalidTransition as exc:
+        messages.error(request, str(exc))
+    else:
+        if moved:
+            messages.success(request, f'Booking {to_status}.')
+        else:
+            messages.warning(request, 'That booking was updated elsewhere; please review it again.')
+    return redirect('vendor_dashboard')
+
+
+def vendor_reviews(request):
     vendor_profile = _get_vendor_profile(request.user)
-    reviews = Review.objects.filter(package__vendor=request.user).order_by('-created_at')
+    reviews = review_history(request.user)
     return render(request, 'accounts/vendor_reviews.html', {
         'vendor_profile': vendor_profile,
         'active_page': 'reviews',
@@ -216,47 +241,64 @@ def vendor_reviews(request):
     })
 
 
-@login_required(login_url='vendor_login')
 def vendor_analytics(request):
-    if not _ensure_vendor(request):
-        return redirect('vendor_login')
-
     vendor_profile = _get_vendor_profile(request.user)
     vendor_packages = Package.objects.filter(vendor=request.user)
     vendor_bookings = Booking.objects.filter(package__vendor=request.user)
-    total_revenue = vendor_bookings.filter(status='confirmed').aggregate(
+    archived_bookings, archived_revenue = archived_totals(request.user)
+    total_revenue = (vendor_bookings.filter(status='confirmed').aggregate(
         total=Sum('total_price')
-    )['total'] or 0
+    )['total'] or 0) + archived_revenue
+    ratings = vendor_ratings(request.user)
 
     analytics = {
         'packages': vendor_packages.count(),
-        'bookings': vendor_bookings.count(),
+        'bookings': vendor_bookings.count() + archived_bookings,
         'revenue': float(total_revenue),
-        'reviews': Review.objects.filter(package__vendor=request.user).count(),
-        'avg_rating': Review.objects.filter(package__vendor=request.user).aggregate(
-            avg=Avg('rating')
-        )['avg'] or 0,
+        'reviews': ratings['count'],
+        'avg_rating': ratings['avg'],
     }
 
+    # Booking history reaches into the archive only for ranges that need it.
+    today = timezone.now().date()
+    history_start = _parse_date(request.GET.get('from')) or today - timedelta(days=90)
+    history_end = _parse_date(request.GET.get('to')) or today
+    package_titles = dict(vendor_packages.values_list('id', 'title'))
+    history = [
+        dict(row, package_title=package_titles.get(row['package_id'], ''))
+        for row in booking_history(request.user, history_start, history_end)[:HISTORY_LIMIT]
+    ]
+
     return render(request, 'accounts/vendor_analytics.html', {
         'vendor_profile': vendor_profile,
         'active_page': 'analytics',
         'analytics': analytics,
+        'history': history,
+        'history_start': history_start,
+        'history_end': history_end,
+        'history_limit': HISTORY_LIMIT,
     })
 
 
-@login_required(login_url='vendor_login')
 def vendor_settings(request):
-    if not _ensure_vendor(request):
-        return redirect('vendor_login')
-
     vendor_profile = _get_vendor_profile(request.user)
+    calendar_feed_url = request.build_absolute_uri(
+        reverse('booking_calendar', args=[feed_token(request.user)])
+    )
     return render(request, 'accounts/vendor_settings.html', {
         'vendor_profile': vendor_profile,
         'active_page': 'settings',
+        'calendar_feed_url': calendar_feed_url,
     })
 
 
+@require_POST
+def vendor_calendar_reset(request):
+    rotate_feed_token(request.user)
+    messages.success(request, 'Calendar feed link reset. Subscribe again with the new link.')
+    return redirect('vendor_settings')
+
+
 @csrf_protect
 def vendor_login(request):
     if request.method == 'POST':
@@ -296,11 +338,23 @@ def vendor_register(request):
         password = request.POST.get('password')
         confirm_password = request.POST.get('confirm_password')
         business_license = request.FILES.get('business_license')
+        upload_error = getattr(request, 'upload_errors', {}).get('business_license')
         
         if password != confirm_password:
             messages.error(request, 'Passwords do not match')
             return render(request, 'accounts/vendor_register.html')
         
+        if upload_error:
+            messages.error(request, f'Business license: {upload_error}')
+            return render(request, 'accounts/vendor_register.html')
+        
+        if business_license:
+            try:
+                validate_license(business_license)
+            except UploadRejected as e:
+                messages.error(request, str(e))
+                return render(request, 'accounts/vendor_register.html')
+        
         if User.objects.filter(email=email).exists():
             messages.error(request, 'Email already registered')
             return render(request, 'accounts/vendor_register.html')
@@ -314,12 +368,12 @@ def vendor_register(request):
             phone=phone
         )
         
-        # Create vendor profile
+        # Create vendor profile; the license goes to content-addressed storage
         VendorProfile.objects.create(
             user=user,
             business_name=business_name,
             owner_name=owner_name,
-            business_license=business_license
+            business_license=store_license(business_license) if business_license else None
         )
         
         # Send OTP
@@ -0,0 +1,41 @@
+"""Shared bootstrap for the benchmark scripts: configure Django on a throwaway test DB."""
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'travel_platform.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import setup_test_environment, teardown_test_environment  # noqa: E402
+
+
+@contextmanager
+def test_database():
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def make_vendor(email='bench-vendor@example.com'):
+    from accounts.models import User, VendorProfile
+
+    user = User.objects.create_user(
+        username=email,
+        email=email,
+        password='bench-password',
+        user_type='vendor',
+        is_verified=True,
+    )
+    VendorProfile.objects.create(user=user, business_name='Bench Treks', owner_name='Bench')
+    return user
@@ -0,0 +1,57 @@
+"""Bytes on the wire and time to first byte for heavy HTML pages, per encoding.
+
+    python benchmarks/bench_compression.py [--requests 50]
+"""
+import argparse
+import time
+
+from _django import make_vendor, test_database
+
+from django.test import Client
+
+PAGES = [
+    ('landing', '/'),
+    ('dashboard', '/accounts/vendor/dashboard/'),
+]
+ENCODINGS = ['identity', 'gzip', 'br']
+
+
+def measure(client, url, encoding, requests):
+    body_size = 0
+    first_byte = 0.0
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = client.get(url, HTTP_ACCEPT_ENCODING=encoding)
+        if response.streaming:
+            body = b''
+            for index, chunk in enumerate(response.streaming_content):
+                if index == 0:
+                    first_byte += time.perf_counter() - started
+                body += chunk
+        else:
+            first_byte += time.perf_counter() - started
+            body = response.content
+        body_size = len(body)
+        served = response.get('Content-Encoding', 'identity')
+    return body_size, served, first_byte / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=50)
+    args = parser.parse_args()
+
+    with test_database():
+        client = Client()
+        client.force_login(make_vendor())
+        print(f'{"page":<12}{"accept":<10}{"served":<10}{"bytes":>9}{"ratio":>8}{"ttfb ms":>10}')
+        for label, url in PAGES:
+            baseline = None
+            for encoding in ENCODINGS:
+                size, served, ttfb = measure(client, url, encoding, args.requests)
+                baseline = baseline or size
+                print(f'{label:<12}{encoding:<10}{served:<10}{size:>9}{size / baseline:>8.2f}{ttfb:>10.2f}')
+
+
+if __name__ == '__main__':
+    main()
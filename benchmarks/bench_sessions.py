@@ -0,0 +1,67 @@
+"""Session storage cost per authenticated vendor request, per session engine.
+
+    python benchmarks/bench_sessions.py [--requests 200]
+"""
+import argparse
+import time
+
+from _django import make_vendor, test_database
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+
+from core.sessions import purge_expired_sessions
+
+
+def bench_engine(engine, user, requests):
+    with override_settings(SESSION_ENGINE=engine):
+        cache.clear()
+        client = Client()
+        client.force_login(user)
+        client.get('/accounts/vendor/settings/')  # warm caches
+
+        session_queries = 0
+        started = time.perf_counter()
+        for _ in range(requests):
+            with CaptureQueriesContext(connection) as ctx:
+                client.get('/accounts/vendor/settings/')
+            session_queries += sum('django_session' in q['sql'] for q in ctx.captured_queries)
+        elapsed = time.perf_counter() - started
+    return session_queries / requests, elapsed / requests * 1000
+
+
+def bench_purge(rows):
+    expired = timezone.now() - timezone.timedelta(days=1)
+    Session.objects.bulk_create(
+        Session(session_key=f'bench{i:027d}', session_data='', expire_date=expired)
+        for i in range(rows)
+    )
+    started = time.perf_counter()
+    deleted = purge_expired_sessions(batch_size=1000)
+    return deleted, (time.perf_counter() - started) * 1000, Session.objects.count()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--purge-rows', type=int, default=20000)
+    args = parser.parse_args()
+
+    with test_database():
+        user = make_vendor()
+        print(f'{"engine":<16}{"session queries/req":>22}{"ms/req":>10}')
+        for name, engine in settings.SESSION_ENGINES.items():
+            queries, ms = bench_engine(engine, user, args.requests)
+            print(f'{name:<16}{queries:>22.2f}{ms:>10.2f}')
+
+        deleted, ms, remaining = bench_purge(args.purge_rows)
+        print(f'\npurge_sessions: deleted {deleted} expired rows in {ms:.0f} ms, {remaining} left')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""Startup import profile and test-suite wall time.
+
+    python benchmarks/bench_startup.py [--command check] [--top 15]
+
+Runs `manage.py <command>` under `python -X importtime`, prints the slowest
+imports by cumulative time plus the share owned by project modules, then
+times the test suite under travel_platform.settings_test.
+"""
+import argparse
+import re
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+PROJECT_PACKAGES = ('accounts', 'core', 'travel_platform')
+
+
+def import_profile(command, settings_module):
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', 'manage.py', command, f'--settings={settings_module}'],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_part, cumulative_us, name = line.split('|')
+        rows.append((int(cumulative_us), int(self_part.split(':')[1]), name.strip()))
+    return rows
+
+
+def timed(args):
+    started = time.perf_counter()
+    result = subprocess.run(args, cwd=ROOT, capture_output=True, text=True)
+    return time.perf_counter() - started, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--command', default='check')
+    parser.add_argument('--top', type=int, default=15)
+    parser.add_argument('--settings', default='travel_platform.settings_test')
+    args = parser.parse_args()
+
+    rows = import_profile(args.command, args.settings)
+    total_self = sum(self_us for _, self_us, _ in rows)
+    project_self = sum(
+        self_us for _, self_us, name in rows if name.split('.')[0] in PROJECT_PACKAGES
+    )
+    print(f'import profile of `manage.py {args.command}` ({len(rows)} modules)')
+    print(f'{"cumulative ms":>14}{"self ms":>10}  module')
+    for cumulative_us, self_us, name in sorted(rows, reverse=True)[:args.top]:
+        print(f'{cumulative_us / 1000:>14.1f}{self_us / 1000:>10.1f}  {name}')
+    print(f'\ntotal import time: {total_self / 1000:.1f} ms, project modules: {project_self / 1000:.1f} ms')
+
+    elapsed, _ = timed([sys.executable, 'manage.py', args.command, f'--settings={args.settings}'])
+    print(f'`manage.py {args.command}` wall time: {elapsed * 1000:.0f} ms')
+
+    elapsed, result = timed([sys.executable, 'manage.py', 'test', f'--settings={args.settings}'])
+    match = re.search(r'^Ran (\d+) tests? ', result.stderr, re.MULTILINE)
+    ran = int(match.group(1)) if match else 0
+    if result.returncode or not ran:
+        # A suite that failed or found nothing measures nothing.
+        print(f'test suite: no usable timing ({ran} test(s) ran, exit code {result.returncode})')
+    else:
+        print(f'test suite wall time: {elapsed:.2f} s for {ran} test(s)')
+
+
+if __name__ == '__main__':
+    main()
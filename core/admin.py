@@ -1,5 +1,10 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.http import HttpResponseRedirect
+from .availability import PackageUnavailable, check_availability, hold_inventory
+from .bookings import TRANSITIONS, transition
 from .models import Booking, Package, Review
+from .paginator import EstimatedCountPaginator
 
 
 @admin.register(Package)
@@ -7,13 +12,104 @@ class PackageAdmin(admin.ModelAdmin):
     list_display = ('title', 'vendor', 'price', 'is_active', 'views_count', 'created_at')
     list_filter = ('is_active', 'created_at')
     search_fields = ('title', 'vendor__email')
+    list_select_related = ('vendor',)
+    autocomplete_fields = ('vendor',)
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+
+
+class BookingAdminForm(forms.ModelForm):
+    seats = forms.IntegerField(
+        min_value=1,
+        initial=1,
+        required=False,
+        help_text='Seats to take from the package inventory (new bookings only).',
+    )
+
+    class Meta:
+        model = Booking
+        exclude = ('reserved_seats',)
+
+    def clean(self):
+        cleaned_data = super().clean()
+        package = cleaned_data.get('package')
+        start, end = cleaned_data.get('start_date'), cleaned_data.get('end_date')
+        if not self.instance._state.adding or not (package and start and end):
+            return cleaned_data
+        if start > end:
+            raise forms.ValidationError('The start date must not be after the end date.')
+        if not check_availability(package, start, end, cleaned_data.get('seats') or 1):
+            raise forms.ValidationError(f'{package} is fully booked for the selected dates.')
+        return cleaned_data
+
+
+class BookingChangeForm(forms.ModelForm):
+    class Meta:
+        model = Booking
+        exclude = ('reserved_seats',)
+
+    def clean_status(self):
+        status = self.cleaned_data['status']
+        previous = self.initial.get('status')
+        if status != previous and status not in TRANSITIONS.get(previous, ()):
+            raise forms.ValidationError(f'A {previous} booking cannot be moved to {status}.')
+        return status
 
 
 @admin.register(Booking)
 class BookingAdmin(admin.ModelAdmin):
+    form = BookingAdminForm
     list_display = ('package', 'traveler', 'status', 'source', 'start_date', 'end_date', 'total_price')
     list_filter = ('status', 'source', 'start_date')
     search_fields = ('package__title', 'traveler__email')
+    list_select_related = ('package', 'traveler')
+    autocomplete_fields = ('package', 'traveler')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
+    readonly_fields = ('reserved_seats',)
+
+    def get_readonly_fields(self, request, obj=None):
+        # Held inventory is tied to the package and dates it was taken for.
+        if obj is not None and obj.reserved_seats:
+            return self.readonly_fields + ('package', 'start_date', 'end_date')
+        return self.readonly_fields
+
+    def get_form(self, request, obj=None, **kwargs):
+        if obj is not None:
+            # Seats are only taken when a booking is added.
+            kwargs['form'] = BookingChangeForm
+        return super().get_form(request, obj, **kwargs)
+
+    def changeform_view(self, request, object_id=None, form_url='', extra_context=None):
+        try:
+            return super().changeform_view(request, object_id, form_url, extra_context)
+        except PackageUnavailable as exc:
+            # The last seat went between clean() and save_model(). The view's
+            # transaction has rolled the add back, so report it on the form page.
+            self.message_user(request, f'The booking was not saved: {exc}', messages.ERROR)
+            return HttpResponseRedirect(request.get_full_path())
+
+    def save_model(self, request, obj, form, change):
+        if not change:
+            # Raises PackageUnavailable if the seats went since clean(); see
+            # changeform_view.
+            obj.reserved_seats = hold_inventory(
+                obj.package, obj.start_date, obj.end_date, form.cleaned_data.get('seats') or 1,
+            )
+            super().save_model(request, obj, form, change)
+            return
+
+        # Status changes go through the state machine so cancelling gives
+        # back held inventory; the other fields are saved as usual.
+        to_status, previous = obj.status, form.initial['status']
+        obj.status = previous
+        fields = [name for name in form.changed_data if name != 'status']
+        if fields:
+            obj.save(update_fields=fields)
+        if to_status != previous and not transition(obj, to_status, expected=previous):
+            self.message_user(
+                request, 'The booking status was changed by someone else; it was left as is.', messages.WARNING,
+            )
 
 
 @admin.register(Review)
@@ -21,3 +117,7 @@ class ReviewAdmin(admin.ModelAdmin):
     list_display = ('package', 'traveler', 'rating', 'created_at')
     list_filter = ('rating', 'created_at')
     search_fields = ('package__title', 'traveler__email')
+    list_select_related = ('package', 'traveler')
+    autocomplete_fields = ('package', 'traveler')
+    show_full_result_count = False
+    paginator = EstimatedCountPaginator
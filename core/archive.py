@@ -0,0 +1,167 @@
+from collections import defaultdict
+from datetime import timedelta
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Max, Sum
+from django.utils import timezone
+
+from .models import ArchivedBooking, ArchivedReview, Booking, BookingArchiveStats, Review
+from .signals import suspend_counters
+
+BOOKING_FIELDS = (
+    'id', 'package_id', 'traveler_id', 'start_date', 'end_date',
+    'status', 'source', 'total_price', 'created_at',
+)
+
+
+def archive_cutoff(days=None):
+    days = settings.ARCHIVE_AFTER_DAYS if days is None else days
+    return timezone.now().date() - timedelta(days=days)
+
+
+def _record_stats(bookings):
+    totals = defaultdict(lambda: [0, Decimal('0')])
+    for booking in bookings:
+        entry = totals[(booking.package_id, booking.status, booking.source)]
+        entry[0] += 1
+        entry[1] += booking.total_price
+
+    BookingArchiveStats.objects.bulk_create(
+        [
+            BookingArchiveStats(package_id=package_id, status=status, source=source)
+            for package_id, status, source in totals
+        ],
+        ignore_conflicts=True,
+    )
+    for (package_id, status, source), (count, revenue) in totals.items():
+        BookingArchiveStats.objects.filter(package_id=package_id, status=status, source=source).update(
+            bookings=F('bookings') + count,
+            revenue=F('revenue') + revenue,
+        )
+
+
+def archive_bookings(days=None, batch_size=1000, max_batches=None):
+    """Move bookings that ended before the horizon into ArchivedBooking.
+
+    Each batch is one transaction: copy rows, fold them into
+    BookingArchiveStats, delete the originals. Returns the number moved.
+    """
+    cutoff = archive_cutoff(days)
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            batch = list(
+                Booking.objects.select_for_update()
+                .filter(end_date__lt=cutoff)
+                .order_by('pk')[:batch_size]
+            )
+            if not batch:
+                break
+            ArchivedBooking.objects.bulk_create(
+                [ArchivedBooking(**{field: getattr(b, field) for field in BOOKING_FIELDS}) for b in batch],
+                ignore_conflicts=True,
+            )
+            _record_stats(batch)
+            with suspend_counters():
+                Booking.objects.filter(pk__in=[b.pk for b in batch]).delete()
+        moved += len(batch)
+        batches += 1
+    return moved
+
+
+def archive_reviews(days=None, batch_size=1000, max_batches=None):
+    """Move reviews written before the horizon into ArchivedReview.
+
+    Package rating counters are left untouched, so averages still include them.
+    """
+    cutoff = archive_cutoff(days)
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            batch = list(
+                Review.objects.select_for_update()
+                .filter(created_at__date__lt=cutoff)
+                .order_by('pk')[:batch_size]
+            )
+            if not batch:
+                break
+            ArchivedReview.objects.bulk_create(
+                [
+                    ArchivedReview(
+                        id=r.id,
+                        package_id=r.package_id,
+                        traveler_id=r.traveler_id,
+                        rating=r.rating,
+                        comment=r.comment,
+                        created_at=r.created_at,
+                    )
+                    for r in batch
+                ],
+                ignore_conflicts=True,
+            )
+            with suspend_counters():
+                Review.objects.filter(pk__in=[r.pk for r in batch]).delete()
+        moved += len(batch)
+        batches += 1
+    return moved
+
+
+def booking_history(vendor, start=None, end=None):
+    """Bookings (as dicts) for a vendor's packages that overlap [start, end].
+
+    The newest archived end date is looked up first (an indexed MAX); the
+    archive itself is only queried when the range reaches back past it, so
+    recent ranges cost that lookup plus a single live-table query.
+    """
+    live = Booking.objects.filter(package__vendor=vendor)
+    archived = ArchivedBooking.objects.filter(package__vendor=vendor)
+    if start is not None:
+        live = live.filter(end_date__gte=start)
+        archived = archived.filter(end_date__gte=start)
+    if end is not None:
+        live = live.filter(start_date__lte=end)
+        archived = archived.filter(start_date__lte=end)
+
+    live = live.values(*BOOKING_FIELDS)
+    newest_archived = ArchivedBooking.objects.aggregate(newest=Max('end_date'))['newest']
+    if newest_archived is None or (start is not None and start > newest_archived):
+        return live.order_by('start_date', 'id')
+    return live.union(archived.values(*BOOKING_FIELDS), all=True).order_by('start_date', 'id')
+
+
+def review_history(vendor):
+    """Live and archived reviews of a vendor's packages, newest first.
+
+    Both kinds have package, traveler, rating, comment and created_at, so
+    templates can list them side by side; two queries.
+    """
+    live = Review.objects.filter(package__vendor=vendor).select_related('package', 'traveler')
+    archived = ArchivedReview.objects.filter(package__vendor=vendor).select_related('package', 'traveler')
+    return sorted([*live, *archived], key=lambda review: review.created_at, reverse=True)
+
+
+def archived_totals(vendor):
+    """(booking count, confirmed revenue) of a vendor's archived bookings"""
+    rows = BookingArchiveStats.objects.filter(package__vendor=vendor).values('status').annotate(
+        bookings=Sum('bookings'),
+        revenue=Sum('revenue'),
+    )
+    count = 0
+    revenue = Decimal('0')
+    for row in rows:
+        count += row['bookings'] or 0
+        if row['status'] == 'confirmed':
+            revenue += row['revenue'] or 0
+    return count, revenue
+
+
+def archived_source_counts(vendor):
+    """{source: count} of a vendor's archived bookings"""
+    rows = BookingArchiveStats.objects.filter(package__vendor=vendor).values('source').annotate(
+        bookings=Sum('bookings'),
+    )
+    return {row['source']: row['bookings'] or 0 for row in rows}
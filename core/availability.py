@@ -0,0 +1,112 @@
+from datetime import timedelta
+
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Greatest
+
+from .models import Booking, PackageInventory
+
+
+class PackageUnavailable(Exception):
+    """Raised when a package has no capacity left for the requested dates"""
+
+
+def _days(start, end):
+    if start > end:
+        raise ValueError('start must not be after end')
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def check_availability(package, start, end, seats=1):
+    """Return True if `seats` can be booked on every day from start to end (inclusive).
+
+    One indexed range query over the (package, date) unique index.
+    """
+    _days(start, end)
+    if package.capacity is None:
+        return True
+    if seats > package.capacity:
+        return False
+    return not PackageInventory.objects.filter(
+        package=package,
+        date__range=(start, end),
+        reserved__gt=package.capacity - seats,
+    ).exists()
+
+
+def hold_inventory(package, start, end, seats=1):
+    """Take `seats` on every day of the range; returns the seats held.
+
+    Returns 0 for packages without a capacity. Must run inside a transaction;
+    raises PackageUnavailable (and takes nothing) when any day is full.
+    """
+    days = _days(start, end)
+    if package.capacity is None:
+        return 0
+    if seats > package.capacity:
+        raise PackageUnavailable(f'{package} only has {package.capacity} seat(s) per day.')
+
+    PackageInventory.objects.bulk_create(
+        [PackageInventory(package=package, date=day) for day in days],
+        ignore_conflicts=True,
+    )
+    days_qs = PackageInventory.objects.filter(package=package, date__range=(start, end))
+    # Lock the day rows in date order so overlapping reservations
+    # queue behind each other instead of deadlocking.
+    list(days_qs.select_for_update().order_by('date').values_list('pk', flat=True))
+    updated = days_qs.filter(reserved__lte=package.capacity - seats).update(
+        reserved=F('reserved') + seats,
+    )
+    if updated != len(days):
+        raise PackageUnavailable(f'{package} is fully booked for the selected dates.')
+    return seats
+
+
+def reserve(package, start, end, traveler=None, seats=1, total_price=None, source='direct'):
+    """Atomically take inventory for the date range and create a pending booking"""
+    if total_price is None:
+        total_price = package.price * seats
+
+    with transaction.atomic():
+        reserved_seats = hold_inventory(package, start, end, seats)
+        return Booking.objects.create(
+            package=package,
+            traveler=traveler,
+            start_date=start,
+            end_date=end,
+            total_price=total_price,
+            source=source,
+            reserved_seats=reserved_seats,
+        )
+
+
+def release(package_id, start, end, seats):
+    """Give back `seats` taken by hold_inventory(), e.g. when a booking is cancelled"""
+    if not seats:
+        return 0
+    return PackageInventory.objects.filter(
+        package_id=package_id,
+        date__range=(start, end),
+        reserved__gte=seats,
+    ).update(reserved=F('reserved') - seats)
+
+
+def release_bookings(booking_ids):
+    """Give back the inventory held by the given bookings in a single UPDATE.
+
+    Each (package, day) row drops by the seats of every listed booking that
+    covers it, so a batch spanning many packages and ranges is one statement.
+    Call before the bookings' reserved_seats are cleared.
+    """
+    holding = Booking.objects.filter(pk__in=booking_ids, reserved_seats__gt=0)
+    covering = holding.filter(
+        package_id=OuterRef('package_id'),
+        start_date__lte=OuterRef('date'),
+        end_date__gte=OuterRef('date'),
+    )
+    seats = covering.order_by().values('package_id').annotate(total=Sum('reserved_seats')).values('total')
+    return PackageInventory.objects.filter(
+        package_id__in=holding.values('package_id'),
+    ).filter(Exists(covering)).update(
+        reserved=Greatest(F('reserved') - Subquery(seats), Value(0)),
+    )
@@ -0,0 +1,49 @@
+import logging
+import queue
+import threading
+
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundWorker:
+    """Single daemon thread that runs queued callables off the request path"""
+
+    def __init__(self, name):
+        self.name = name
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            func, args, kwargs = self._queue.get()
+            try:
+                func(*args, **kwargs)
+            except Exception:
+                logger.exception('Background task %r failed', func)
+            finally:
+                close_old_connections()
+                self._queue.task_done()
+
+    def enqueue(self, func, *args, **kwargs):
+        if getattr(settings, 'BACKGROUND_TASKS_EAGER', False):
+            func(*args, **kwargs)
+            return
+        self._queue.put((func, args, kwargs))
+        self._ensure_started()
+
+    def join(self):
+        """Block until every queued task has run (used by management commands)"""
+        self._queue.join()
+
+
+worker = BackgroundWorker('namaste-nomad-background')
@@ -0,0 +1,94 @@
+from django.db import transaction
+
+from .availability import release_bookings
+from .models import Booking, Package
+from .signals import bookings_changed
+
+# status -> statuses it may move to
+TRANSITIONS = {
+    'pending': {'confirmed', 'cancelled'},
+    'confirmed': {'cancelled'},
+    'cancelled': set(),
+}
+
+
+class InvalidTransition(Exception):
+    """Raised when a booking cannot move to the requested status"""
+
+
+def _sources(to_status):
+    sources = [status for status, targets in TRANSITIONS.items() if to_status in targets]
+    if not sources:
+        raise InvalidTransition(f'No booking can move to {to_status!r}.')
+    return sources
+
+
+def _notify(vendor_id, to_status, count):
+    if count:
+        transaction.on_commit(lambda: bookings_changed.send(
+            sender=Booking, vendor_id=vendor_id, status=to_status, count=count,
+        ))
+
+
+def _cancel(bookings):
+    """Cancel the given bookings and hand back the inventory they hold.
+
+    Three statements however many rows: lock, one inventory UPDATE, one
+    booking UPDATE that also clears the reserved-seat marker.
+    """
+    booking_ids = list(bookings.select_for_update().values_list('pk', flat=True))
+    if not booking_ids:
+        return 0
+    release_bookings(booking_ids)
+    return Booking.objects.filter(pk__in=booking_ids).update(status='cancelled', reserved_seats=0)
+
+
+def transition(booking, to_status, expected=None):
+    """Move one booking to `to_status` if it is still in `expected`.
+
+    Optimistic: a conditional UPDATE ... WHERE status=<expected>. Returns
+    False when another request changed the booking first.
+    """
+    expected = expected or booking.status
+    if to_status not in TRANSITIONS.get(expected, ()):
+        raise InvalidTransition(f'Cannot move a {expected} booking to {to_status}.')
+
+    bookings = Booking.objects.filter(pk=booking.pk, status=expected)
+    with transaction.atomic():
+        if to_status == 'cancelled':
+            updated = _cancel(bookings)
+        else:
+            updated = bookings.update(status=to_status)
+        if not updated:
+            return False
+        vendor_id = Package.objects.filter(pk=booking.package_id).values_list('vendor_id', flat=True).first()
+        _notify(vendor_id, to_status, updated)
+
+    booking.status = to_status
+    if to_status == 'cancelled':
+        booking.reserved_seats = 0
+    return True
+
+
+def bulk_transition(vendor, booking_ids, to_status):
+    """Move many of a vendor's bookings to `to_status`; returns how many moved.
+
+    Bookings already past the allowed source statuses are skipped. Confirming
+    is one UPDATE; cancelling is three statements (see _cancel) for any batch
+    size. Listeners get a single bookings_changed event for the batch.
+    """
+    sources = _sources(to_status)
+    bookings = Booking.objects.filter(
+        pk__in=booking_ids,
+        package__vendor=vendor,
+        status__in=sources,
+    )
+
+    with transaction.atomic():
+        if to_status == 'cancelled':
+            updated = _cancel(bookings)
+        else:
+            updated = bookings.update(status=to_status)
+        _notify(vendor.pk, to_status, updated)
+
+    return updated
@@ -0,0 +1,101 @@
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Booking, CalendarFeed, new_feed_key
+
+DEFAULT_WINDOW_DAYS = 90
+MAX_WINDOW_DAYS = 366
+
+
+def feed_token(vendor):
+    """Secret token for the vendor's feed URL (calendar clients can't log in)"""
+    feed, _ = CalendarFeed.objects.get_or_create(vendor=vendor)
+    return feed.key
+
+
+def rotate_feed_token(vendor):
+    """Replace the vendor's feed token, revoking every URL handed out so far"""
+    feed, _ = CalendarFeed.objects.update_or_create(vendor=vendor, defaults={'key': new_feed_key()})
+    return feed.key
+
+
+def feed_for_token(token):
+    """{'vendor_id', 'version'} for a feed token, or None; one unique-index lookup"""
+    return CalendarFeed.objects.filter(key=token).values('vendor_id', 'version').first()
+
+
+def bump_feed_version(vendor_id):
+    # Kept in the database so every worker sees the change, unlike a
+    # process-local cache.
+    if vendor_id is not None:
+        CalendarFeed.objects.filter(vendor_id=vendor_id).update(version=F('version') + 1)
+
+
+def bump_package_feed_version(package_id):
+    CalendarFeed.objects.filter(vendor__vendor_packages=package_id).update(version=F('version') + 1)
+
+
+def feed_window(start=None, days=None):
+    start = start or timezone.now().date()
+    days = min(max(days or DEFAULT_WINDOW_DAYS, 1), MAX_WINDOW_DAYS)
+    return start, start + timedelta(days=days)
+
+
+def upcoming_bookings(vendor_id, start, end):
+    """Non-cancelled bookings starting in [start, end]; one indexed query"""
+    return (
+        Booking.objects.filter(package__vendor_id=vendor_id, start_date__range=(start, end))
+        .exclude(status='cancelled')
+        .order_by('start_date')
+        .values('id', 'start_date', 'end_date', 'status', 'package__title')
+    )
+
+
+def _escape(text):
+    return (
+        text.replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+    )
+
+
+def _fold(line):
+    """Split a content line into lines of at most 75 octets joined by CRLF + space (RFC 5545 3.1)"""
+    data = line.encode()
+    chunks = []
+    limit = 75
+    while len(data) > limit:
+        cut = limit
+        # Never split a multi-byte UTF-8 character.
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        chunks.append(data[:cut])
+        data = data[cut:]
+        limit = 74  # the leading space of a continuation line counts too
+    chunks.append(data)
+    return '\r\n '.join(chunk.decode() for chunk in chunks)
+
+
+def render_ics(bookings, vendor_id):
+    stamp = timezone.now().strftime('%Y%m%dT%H%M%SZ')
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Namaste Nomad//Vendor Bookings//EN',
+        'CALSCALE:GREGORIAN',
+        f'X-WR-CALNAME:{_escape("Namaste Nomad bookings")}',
+    ]
+    for booking in bookings:
+        lines += [
+            'BEGIN:VEVENT',
+            f'UID:booking-{booking["id"]}@namaste-nomad-{vendor_id}',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART;VALUE=DATE:{booking["start_date"]:%Y%m%d}',
+            # DTEND is exclusive for all-day events; booking end dates are inclusive.
+            f'DTEND;VALUE=DATE:{booking["end_date"] + timedelta(days=1):%Y%m%d}',
+            f'SUMMARY:{_escape(booking["package__title"])} ({booking["status"]})',
+            f'STATUS:{"CONFIRMED" if booking["status"] == "confirmed" else "TENTATIVE"}',
+            'END:VEVENT',
+        ]
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(_fold(line) for line in lines) + '\r\n'
@@ -0,0 +1,27 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+CACHE_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def _process_local_cache():
+    return settings.CACHES['default']['BACKEND'] in settings.PROCESS_LOCAL_CACHES
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    """Cache-backed state must not live in a per-process cache in production"""
+    if settings.DEBUG or not _process_local_cache():
+        return []
+    errors = []
+    if settings.SESSION_ENGINE in CACHE_SESSION_ENGINES:
+        errors.append(Warning(
+            f'{settings.SESSION_ENGINE} sessions are stored in a process-local cache.',
+            hint='Logouts are not seen by other workers. Configure a shared cache '
+                 '(DJANGO_CACHE_BACKEND) or use DJANGO_SESSION_ENGINE=db.',
+            id='core.W001',
+        ))
+    return errors
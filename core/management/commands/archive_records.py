@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from core.archive import archive_bookings, archive_reviews
+
+
+class Command(BaseCommand):
+    help = 'Move old bookings and reviews from the live tables into the archive tables.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.ARCHIVE_AFTER_DAYS)
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches per table.')
+
+    def handle(self, *args, **options):
+        kwargs = {
+            'days': options['days'],
+            'batch_size': options['batch_size'],
+            'max_batches': options['max_batches'],
+        }
+        bookings = archive_bookings(**kwargs)
+        reviews = archive_reviews(**kwargs)
+        self.stdout.write(self.style.SUCCESS(f'Archived {bookings} booking(s) and {reviews} review(s).'))
@@ -0,0 +1,27 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.sessions import purge_expired_sessions
+
+
+class Command(BaseCommand):
+    help = 'Delete expired sessions in batches, optionally on a fixed schedule.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None)
+        parser.add_argument('--pause', type=float, default=0, help='Seconds to sleep between batches.')
+        parser.add_argument(
+            '--every',
+            type=int,
+            default=0,
+            help='Keep running and purge every N seconds instead of exiting.',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            deleted = purge_expired_sessions(options['batch_size'], options['pause'])
+            self.stdout.write(f'Purged {deleted} expired session(s).')
+            if not options['every']:
+                break
+            time.sleep(options['every'])
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from core.models import Package
+from core.popularity import rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Recompute denormalized booking/review counters and popularity scores.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        last_pk = 0
+        total = 0
+        while True:
+            pks = list(
+                Package.objects.filter(pk__gt=last_pk)
+                .order_by('pk')
+                .values_list('pk', flat=True)[:batch_size]
+            )
+            if not pks:
+                break
+            total += rebuild_counters(Package.objects.filter(pk__in=pks))
+            last_pk = pks[-1]
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt stats for {total} package(s).'))
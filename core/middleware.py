@@ -0,0 +1,177 @@
+import mimetypes
+import os
+import re
+import secrets
+
+from django.conf import settings
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.http import FileResponse, HttpResponseNotModified
+from django.middleware.gzip import GZipMiddleware
+from django.utils._os import safe_join
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; responses fall back to gzip
+    brotli = None
+
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+DEFAULT_CACHE_CONTROL = 'public, max-age=60'
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+_HASHED_NAME_RE = re.compile(r'\.[0-9a-f]{12}\.')
+_ACCEPTS_BR_RE = re.compile(r'\bbr\b')
+
+# Payloads in these formats are already compressed; recompressing wastes CPU.
+INCOMPRESSIBLE_TYPES = (
+    'image/', 'video/', 'audio/', 'font/woff',
+    'application/zip', 'application/gzip', 'application/pdf', 'application/octet-stream',
+)
+BROTLI_QUALITY = 5
+
+
+class StaticFilesMiddleware:
+    """Serve collected static files straight from STATIC_ROOT (WhiteNoise-style).
+
+    Fingerprinted names get far-future immutable caching, and the .br/.gz
+    variants written by CompressedManifestStaticFilesStorage are picked by
+    Accept-Encoding. In DEBUG, runserver's own static handling is left alone.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = settings.STATIC_URL
+        if not self.prefix.startswith('/'):
+            self.prefix = '/' + self.prefix
+        # Built once so each request is a set lookup rather than a manifest scan.
+        self.hashed_names = frozenset((getattr(staticfiles_storage, 'hashed_files', None) or {}).values())
+
+    def __call__(self, request):
+        if (
+            not settings.DEBUG
+            and settings.STATIC_ROOT
+            and request.method in ('GET', 'HEAD')
+            and request.path_info.startswith(self.prefix)
+        ):
+            response = self.serve(request, request.path_info[len(self.prefix):])
+            if response is not None:
+                return response
+        return self.get_response(request)
+
+    def is_immutable(self, name):
+        if self.hashed_names:
+            return name in self.hashed_names
+        return bool(_HASHED_NAME_RE.search(os.path.basename(name)))
+
+    def serve(self, request, name):
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except ValueError:
+            return None
+        if not os.path.isfile(path):
+            return None
+
+        cache_control = IMMUTABLE_CACHE_CONTROL if self.is_immutable(name) else DEFAULT_CACHE_CONTROL
+        etag = f'"{int(os.path.getmtime(path))}-{os.path.getsize(path)}"'
+        if request.headers.get('If-None-Match') == etag:
+            response = HttpResponseNotModified()
+            response['ETag'] = etag
+            response['Cache-Control'] = cache_control
+            return response
+
+        content_type, _ = mimetypes.guess_type(path)
+        accepted = request.headers.get('Accept-Encoding', '')
+        encoding = None
+        for candidate, suffix in ENCODINGS:
+            if candidate in accepted and os.path.isfile(path + suffix):
+                path, encoding = path + suffix, candidate
+                break
+
+        response = FileResponse(open(path, 'rb'), content_type=content_type or 'application/octet-stream')
+        if encoding:
+            response['Content-Encoding'] = encoding
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        patch_vary_headers(response, ('Accept-Encoding',))
+        return response
+
+
+def _html_padding(max_random_bytes):
+    """An HTML comment of random, incompressible content and random length.
+
+    Brotli has no equivalent of the gzip header filename Django pads for
+    BREACH mitigation, so the random length goes into the page instead.
+    """
+    return f'<!-- {secrets.token_urlsafe(secrets.randbelow(max_random_bytes + 1))} -->'.encode()
+
+
+def _brotli_sequence(sequence, padding=b''):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    for chunk in sequence:
+        # Flush per chunk so streamed pages keep their time-to-first-byte.
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.process(padding) + compressor.finish()
+
+
+async def _brotli_async_sequence(sequence, padding=b''):
+    compressor = brotli.Compressor(quality=BROTLI_QUALITY)
+    async for chunk in sequence:
+        data = compressor.process(chunk) + compressor.flush()
+        if data:
+            yield data
+    yield compressor.process(padding) + compressor.finish()
+
+
+class CompressionMiddleware(GZipMiddleware):
+    """GZipMiddleware plus Brotli negotiation and skipping of precompressed types.
+
+    Small bodies (under 200 bytes), responses that already carry a
+    Content-Encoding and binary media types are passed through untouched;
+    streaming responses are compressed chunk by chunk.
+
+    Like the gzip path, brotli output gets a random length (BREACH): HTML is
+    padded with a random comment, and other responses that may carry the
+    CSRF token are left to gzip, which can pad without touching the body.
+    """
+
+    min_length = 200
+
+    def process_response(self, request, response):
+        content_type = response.get('Content-Type', '')
+        if content_type.startswith(INCOMPRESSIBLE_TYPES):
+            return response
+        accepts_br = _ACCEPTS_BR_RE.search(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+        is_html = content_type.startswith('text/html')
+        if brotli is None or not accepts_br:
+            return super().process_response(request, response)
+        if not is_html and request.META.get('CSRF_COOKIE_NEEDS_UPDATE'):
+            return super().process_response(request, response)
+
+        if not response.streaming and len(response.content) < self.min_length:
+            return response
+        if response.has_header('Content-Encoding'):
+            return response
+
+        patch_vary_headers(response, ('Accept-Encoding',))
+        padding = _html_padding(self.max_random_bytes) if is_html else b''
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = _brotli_async_sequence(response.streaming_content, padding)
+            else:
+                response.streaming_content = _brotli_sequence(response.streaming_content, padding)
+            del response.headers['Content-Length']
+        else:
+            compressed = brotli.compress(response.content + padding, quality=BROTLI_QUALITY)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers['Content-Length'] = str(len(compressed))
+
+        etag = response.get('ETag')
+        if etag and etag.startswith('"'):
+            response.headers['ETag'] = 'W/' + etag
+        response.headers['Content-Encoding'] = 'br'
+        return response
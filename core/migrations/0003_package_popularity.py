@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:10
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    Package = apps.get_model('core', 'Package')
+    Booking = apps.get_model('core', 'Booking')
+    Review = apps.get_model('core', 'Review')
+
+    bookings = Booking.objects.filter(package=OuterRef('pk')).order_by().values('package')
+    reviews = Review.objects.filter(package=OuterRef('pk')).order_by().values('package')
+    Package.objects.update(
+        booking_count=Coalesce(Subquery(bookings.annotate(n=Count('pk')).values('n')), 0),
+        review_count=Coalesce(Subquery(reviews.annotate(n=Count('pk')).values('n')), 0),
+        rating_sum=Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0),
+    )
+    # Same formula as core.popularity.popularity_expression() at the time of writing.
+    Package.objects.update(popularity=(
+        (Cast(F('rating_sum'), FloatField()) + Value(17.5))
+        / (Cast(F('review_count'), FloatField()) + Value(5.0))
+        + Cast(F('booking_count'), FloatField()) * Value(0.05)
+        + Cast(F('views_count'), FloatField()) * Value(0.001)
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_package_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='package',
+            name='booking_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='popularity',
+            field=models.FloatField(default=3.5),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='rating_sum',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='package',
+            name='review_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='package',
+            index=models.Index(fields=['is_active', '-popularity'], name='package_active_popular_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='package',
+            index=models.Index(fields=['vendor', '-popularity'], name='package_vendor_popular_idx'),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_package_popularity'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='package',
+            name='capacity',
+            field=models.PositiveIntegerField(blank=True, help_text='Maximum concurrent bookings per day. Leave empty for unlimited.', null=True),
+        ),
+        migrations.CreateModel(
+            name='PackageInventory',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('reserved', models.PositiveIntegerField(default=0)),
+                ('package', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inventory', to='core.package')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('package', 'date'), name='unique_package_inventory_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:11
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_package_inventory'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='booking',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='source',
+            field=models.CharField(choices=[('direct', 'Direct'), ('partner', 'Partner'), ('social', 'Social'), ('marketplace', 'Marketplace')], db_index=True, default='direct', max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='start_date',
+            field=models.DateField(db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='booking',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('cancelled', 'Cancelled')], db_index=True, default='pending', max_length=10),
+        ),
+        migrations.AlterField(
+            model_name='package',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, db_index=True),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='rating',
+            field=models.PositiveSmallIntegerField(db_index=True, validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(5)]),
+        ),
+    ]
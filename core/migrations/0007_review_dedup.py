@@ -0,0 +1,84 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:20
+
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, F, FloatField, Max, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+
+
+def drop_duplicate_reviews(apps, schema_editor):
+    """Keep only the newest review per (traveler, package) so the constraint applies"""
+    ArchivedReview = apps.get_model('core', 'ArchivedReview')
+    Package = apps.get_model('core', 'Package')
+    Review = apps.get_model('core', 'Review')
+
+    duplicates = (
+        Review.objects.filter(traveler__isnull=False)
+        .values('traveler', 'package')
+        .annotate(n=Count('pk'), keep=Max('pk'))
+        .filter(n__gt=1)
+    )
+    affected = set()
+    for row in duplicates.iterator():
+        Review.objects.filter(traveler=row['traveler'], package=row['package']).exclude(
+            pk=row['keep']
+        ).delete()
+        affected.add(row['package'])
+    if not affected:
+        return
+
+    # Counters include archived reviews (core.archive leaves them in place).
+    reviews = Review.objects.filter(package=OuterRef('pk')).order_by().values('package')
+    archived = ArchivedReview.objects.filter(package=OuterRef('pk')).order_by().values('package')
+    packages = Package.objects.filter(pk__in=affected)
+    packages.update(
+        review_count=(
+            Coalesce(Subquery(reviews.annotate(n=Count('pk')).values('n')), 0)
+            + Coalesce(Subquery(archived.annotate(n=Count('pk')).values('n')), 0)
+        ),
+        rating_sum=(
+            Coalesce(Subquery(reviews.annotate(total=Sum('rating')).values('total')), 0)
+            + Coalesce(Subquery(archived.annotate(total=Sum('rating')).values('total')), 0)
+        ),
+    )
+    # Same formula as core.popularity.popularity_expression() at the time of writing.
+    packages.update(popularity=(
+        (Cast(F('rating_sum'), FloatField()) + Value(17.5))
+        / (Cast(F('review_count'), FloatField()) + Value(5.0))
+        + Cast(F('booking_count'), FloatField()) * Value(0.05)
+        + Cast(F('views_count'), FloatField()) * Value(0.001)
+    ))
+
+
+def backfill_vendor_ratings(apps, schema_editor):
+    Package = apps.get_model('core', 'Package')
+    VendorProfile = apps.get_model('accounts', 'VendorProfile')
+
+    packages = Package.objects.filter(vendor=OuterRef('user')).order_by().values('vendor')
+    VendorProfile.objects.update(
+        review_count=Coalesce(Subquery(packages.annotate(n=Sum('review_count')).values('n')), 0),
+        rating_sum=Coalesce(Subquery(packages.annotate(total=Sum('rating_sum')).values('total')), 0),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_archive'),
+        ('accounts', '0003_vendor_rating_totals'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='comment_fingerprint',
+            field=models.CharField(blank=True, db_index=True, max_length=40),
+        ),
+        migrations.RunPython(drop_duplicate_reviews, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(fields=('traveler', 'package'), name='unique_review_per_traveler'),
+        ),
+        migrations.RunPython(backfill_vendor_ratings, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:22
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_review_dedup'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='booking',
+            index=models.Index(fields=['package', 'start_date', 'status'], name='booking_pkg_start_status_idx'),
+        ),
+    ]
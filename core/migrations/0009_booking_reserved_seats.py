@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0008_booking_calendar_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='booking',
+            name='reserved_seats',
+            field=models.PositiveSmallIntegerField(default=0, help_text='Seats this booking holds in the package inventory; given back on cancel.'),
+        ),
+    ]
@@ -1,7 +1,13 @@
+import secrets
+
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
 
+# Bayesian prior rating of core.popularity; a package with no activity scores
+# exactly this, so it is also the popularity of a new package.
+PRIOR_RATING = 3.5
+
 
 class Package(models.Model):
     vendor = models.ForeignKey(
@@ -17,12 +23,34 @@ class Package(models.Model):
         validators=[MinValueValidator(0)],
     )
     is_active = models.BooleanField(default=True)
+    capacity = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Maximum concurrent bookings per day. Leave empty for unlimited.',
+    )
     views_count = models.PositiveIntegerField(default=0)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Denormalized counters maintained by core.signals; see core.popularity.
+    booking_count = models.PositiveIntegerField(default=0)
+    review_count = models.PositiveIntegerField(default=0)
+    rating_sum = models.PositiveIntegerField(default=0)
+    popularity = models.FloatField(default=PRIOR_RATING)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['is_active', '-popularity'], name='package_active_popular_idx'),
+            models.Index(fields=['vendor', '-popularity'], name='package_vendor_popular_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @property
+    def avg_rating(self):
+        if not self.review_count:
+            return 0
+        return self.rating_sum / self.review_count
+
 
 class Booking(models.Model):
     STATUS_CHOICES = [
@@ -46,16 +74,26 @@ class Booking(models.Model):
         null=True,
         blank=True,
     )
-    start_date = models.DateField()
+    start_date = models.DateField(db_index=True)
     end_date = models.DateField()
-    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
-    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='direct')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending', db_index=True)
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='direct', db_index=True)
     total_price = models.DecimalField(
         max_digits=10,
         decimal_places=2,
         validators=[MinValueValidator(0)],
     )
-    created_at = models.DateTimeField(auto_now_add=True)
+    reserved_seats = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Seats this booking holds in the package inventory; given back on cancel.',
+    )
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            # Serves upcoming-booking windows per package (dashboard, calendar feed).
+            models.Index(fields=['package', 'start_date', 'status'], name='booking_pkg_start_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.package.title} ({self.status})"
@@ -72,9 +110,124 @@ class Review(models.Model):
     )
     rating = models.PositiveSmallIntegerField(
         validators=[MinValueValidator(1), MaxValueValidator(5)],
+        db_index=True,
     )
     comment = models.TextField(blank=True)
-    created_at = models.DateTimeField(auto_now_add=True)
+    # Hash of the normalized comment, used by core.reviews to spot copy-paste spam.
+    comment_fingerprint = models.CharField(max_length=40, blank=True, db_index=True)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['traveler', 'package'], name='unique_review_per_traveler'),
+        ]
 
     def __str__(self):
         return f"{self.package.title} - {self.rating}"
+
+
+class PackageInventory(models.Model):
+    """Seats reserved on a package for a single day; see core.availability."""
+
+    package = models.ForeignKey(Package, on_delete=models.CASCADE, related_name='inventory')
+    date = models.DateField()
+    reserved = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['package', 'date'], name='unique_package_inventory_day'),
+        ]
+
+    def __str__(self):
+        return f"{self.package_id} {self.date}: {self.reserved}"
+
+
+def new_feed_key():
+    return secrets.token_urlsafe(32)
+
+
+class CalendarFeed(models.Model):
+    """A vendor's booking calendar subscription; see core.calendar.
+
+    The key is the secret in the feed URL and can be rotated to revoke it;
+    version is bumped whenever the vendor's bookings change.
+    """
+
+    vendor = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='calendar_feed',
+    )
+    key = models.CharField(max_length=64, unique=True, default=new_feed_key)
+    version = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"Calendar feed for {self.vendor}"
+
+
+class ArchivedBooking(models.Model):
+    """A booking moved out of the live table by core.archive; keeps its original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    package = models.ForeignKey(Package, on_delete=models.CASCADE, related_name='archived_bookings')
+    traveler = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='archived_traveler_bookings',
+        null=True,
+        blank=True,
+    )
+    start_date = models.DateField()
+    end_date = models.DateField(db_index=True)
+    status = models.CharField(max_length=10, choices=Booking.STATUS_CHOICES)
+    source = models.CharField(max_length=20, choices=Booking.SOURCE_CHOICES)
+    total_price = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['package', 'start_date'], name='archived_booking_pkg_start_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.package_id} ({self.status}, archived)"
+
+
+class ArchivedReview(models.Model):
+    """A review moved out of the live table by core.archive; keeps its original id."""
+
+    id = models.BigIntegerField(primary_key=True)
+    package = models.ForeignKey(Package, on_delete=models.CASCADE, related_name='archived_reviews')
+    traveler = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        related_name='archived_traveler_reviews',
+        null=True,
+        blank=True,
+    )
+    rating = models.PositiveSmallIntegerField()
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(db_index=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.package_id} - {self.rating} (archived)"
+
+
+class BookingArchiveStats(models.Model):
+    """Per package/status/source totals of archived bookings, so live stats stay complete."""
+
+    package = models.ForeignKey(Package, on_delete=models.CASCADE, related_name='archive_stats')
+    status = models.CharField(max_length=10, choices=Booking.STATUS_CHOICES)
+    source = models.CharField(max_length=20, choices=Booking.SOURCE_CHOICES)
+    bookings = models.PositiveIntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['package', 'status', 'source'], name='unique_booking_archive_stats'),
+        ]
+
+    def __str__(self):
+        return f"{self.package_id} {self.status}: {self.bookings}"
@@ -0,0 +1,48 @@
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import QuerySet
+from django.utils.functional import cached_property
+
+
+def estimate_row_count(model, using='default'):
+    """Cheap row count estimate for a whole table, or None if unsupported"""
+    connection = connections[using]
+    table = model._meta.db_table
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT reltuples::bigint FROM pg_class WHERE relname = %s', [table])
+            row = cursor.fetchone()
+        # reltuples is -1 (or 0 on older servers) until the table is analyzed.
+        return row[0] if row and row[0] > 0 else None
+    # Nothing cheap is reliable elsewhere: on SQLite, MAX(pk) overcounts as
+    # soon as rows are deleted (e.g. moved out by core.archive).
+    return None
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that skips COUNT(*) on large, unfiltered querysets"""
+
+    threshold = 10000
+    estimated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if isinstance(queryset, QuerySet) and not queryset.query.where:
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate > self.threshold:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def page(self, number):
+        page = super().page(number)
+        if self.estimated and not page.object_list and self.validate_number(number) > 1:
+            # The estimate ran past the real end (stale statistics after bulk
+            # deletes): fall back to the exact count so the page numbers and
+            # EmptyPage handling are right again.
+            self.__dict__['count'] = Paginator.count.func(self)
+            self.__dict__.pop('num_pages', None)
+            self.estimated = False
+            return super().page(number)
+        return page
@@ -0,0 +1,71 @@
+from django.db.models import Count, F, FloatField, OuterRef, Subquery, Sum, Value
+from django.db.models.functions import Cast, Coalesce
+
+from .models import PRIOR_RATING, ArchivedBooking, ArchivedReview, Booking, Package, Review
+
+# Bayesian average: every package starts with PRIOR_WEIGHT virtual reviews
+# of PRIOR_RATING, so a single 5-star review cannot top the leaderboard.
+PRIOR_WEIGHT = 5
+BOOKING_WEIGHT = 0.05
+VIEW_WEIGHT = 0.001
+
+
+def popularity_expression(bookings=0, reviews=0, rating=0, views=0):
+    """SQL expression for the popularity score after applying the given deltas.
+
+    Deltas are folded in because every column in an UPDATE's SET clause reads
+    the row's old values.
+    """
+    rating_sum = Cast(F('rating_sum') + rating, FloatField()) + Value(PRIOR_RATING * PRIOR_WEIGHT)
+    review_count = Cast(F('review_count') + reviews, FloatField()) + Value(float(PRIOR_WEIGHT))
+    return (
+        rating_sum / review_count
+        + Cast(F('booking_count') + bookings, FloatField()) * Value(BOOKING_WEIGHT)
+        + Cast(F('views_count') + views, FloatField()) * Value(VIEW_WEIGHT)
+    )
+
+
+def bump_counters(package_id, bookings=0, reviews=0, rating=0, views=0):
+    """Atomically adjust a package's counters and its popularity score"""
+    Package.objects.filter(pk=package_id).update(
+        booking_count=F('booking_count') + bookings,
+        review_count=F('review_count') + reviews,
+        rating_sum=F('rating_sum') + rating,
+        views_count=F('views_count') + views,
+        popularity=popularity_expression(bookings, reviews, rating, views),
+    )
+
+
+def record_view(package_id):
+    bump_counters(package_id, views=1)
+
+
+def top_packages(limit=10, vendor=None, include_inactive=False):
+    """Top-N packages by popularity, active ones only by default; served from an index"""
+    packages = Package.objects.all() if include_inactive else Package.objects.filter(is_active=True)
+    if vendor is not None:
+        packages = packages.filter(vendor=vendor)
+    return packages.order_by('-popularity')[:limit]
+
+
+def _per_package(model, aggregate):
+    rows = model.objects.filter(package=OuterRef('pk')).order_by().values('package')
+    return Coalesce(Subquery(rows.annotate(value=aggregate).values('value')), 0)
+
+
+def rebuild_counters(queryset=None):
+    """Recompute counters from the booking/review tables (backfill/repair).
+
+    Archived rows are counted too: archiving leaves the counters alone, so a
+    rebuild from the live tables only would undercount.
+    """
+    if queryset is None:
+        queryset = Package.objects.all()
+
+    updated = queryset.update(
+        booking_count=_per_package(Booking, Count('pk')) + _per_package(ArchivedBooking, Count('pk')),
+        review_count=_per_package(Review, Count('pk')) + _per_package(ArchivedReview, Count('pk')),
+        rating_sum=_per_package(Review, Sum('rating')) + _per_package(ArchivedReview, Sum('rating')),
+    )
+    queryset.update(popularity=popularity_expression())
+    return updated
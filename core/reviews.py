@@ -0,0 +1,90 @@
+import hashlib
+import re
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from accounts.models import VendorProfile
+from .models import ArchivedReview, Package, Review
+
+_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+class ReviewRejected(Exception):
+    """Raised when a review submission is refused"""
+
+
+def comment_fingerprint(comment):
+    """Hash of a comment's distinct lower-cased words.
+
+    Case, punctuation, spacing, word order and repetition don't change it, so
+    lightly edited copies of the same text collide. Short comments ("Great
+    trip!") are too common to mean anything and get no fingerprint.
+    """
+    words = sorted(set(_WORD_RE.findall((comment or '').lower())))
+    if len(words) < settings.REVIEW_SPAM_MIN_WORDS:
+        return ''
+    return hashlib.sha1(' '.join(words).encode()).hexdigest()
+
+
+def bump_vendor_ratings(package_id, reviews=0, rating=0):
+    """Atomically adjust the running rating totals of a package's vendor"""
+    VendorProfile.objects.filter(user__vendor_packages=package_id).update(
+        review_count=F('review_count') + reviews,
+        rating_sum=F('rating_sum') + rating,
+    )
+
+
+def vendor_ratings(vendor):
+    """{'count', 'avg'} of all reviews (archived included) of a vendor's packages"""
+    # Running totals kept on the profile; a cached request.user profile may
+    # be stale, so they are read fresh by key.
+    totals = VendorProfile.objects.filter(user=vendor).values('review_count', 'rating_sum').first()
+    if totals is None:
+        totals = Package.objects.filter(vendor=vendor).aggregate(
+            review_count=Sum('review_count'), rating_sum=Sum('rating_sum'),
+        )
+    count = totals['review_count'] or 0
+    return {
+        'count': count,
+        'avg': (totals['rating_sum'] / count) if count else 0,
+    }
+
+
+def submit_review(traveler, package, rating, comment=''):
+    """Create a traveler's review of a package.
+
+    Enforces one review per traveler and package and refuses comments that
+    duplicate a recent review elsewhere. The unique index only covers the
+    live table, so reviews moved to ArchivedReview are checked explicitly.
+    """
+    try:
+        rating = int(rating)
+    except (TypeError, ValueError):
+        raise ReviewRejected('Rating must be a whole number.')
+    if not 1 <= rating <= 5:
+        raise ReviewRejected('Rating must be between 1 and 5.')
+
+    if traveler is not None and ArchivedReview.objects.filter(traveler=traveler, package=package).exists():
+        raise ReviewRejected('You have already reviewed this package.')
+
+    fingerprint = comment_fingerprint(comment)
+    if fingerprint:
+        since = timezone.now() - timedelta(days=settings.REVIEW_SPAM_WINDOW_DAYS)
+        if Review.objects.filter(comment_fingerprint=fingerprint, created_at__gte=since).exists():
+            raise ReviewRejected('This review duplicates an existing one.')
+
+    try:
+        with transaction.atomic():
+            return Review.objects.create(
+                package=package,
+                traveler=traveler,
+                rating=rating,
+                comment=comment,
+                comment_fingerprint=fingerprint,
+            )
+    except IntegrityError:
+        raise ReviewRejected('You have already reviewed this package.')
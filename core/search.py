@@ -0,0 +1,206 @@
+import re
+
+from django.core.paginator import Paginator
+from django.db import connection, connections
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from .models import Package
+
+FTS_TABLE = 'core_package_fts'
+PG_SEARCH_CONFIG = 'english'
+PG_SEARCH_VECTOR = (
+    f"to_tsvector('{PG_SEARCH_CONFIG}', "
+    "coalesce(core_package.title, '') || ' ' || coalesce(core_package.description, ''))"
+)
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+
+SQLITE_FTS_TABLE = f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        title, description,
+        content='core_package', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+"""
+
+# SQLite drops triggers whenever a migration rebuilds core_package, so they are
+# reinstalled after migrate runs (see ensure_search_index) as well as in 0002.
+SQLITE_TRIGGERS = [
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_package_fts_ai AFTER INSERT ON core_package BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_package_fts_ad AFTER DELETE ON core_package BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS core_package_fts_au AFTER UPDATE OF title, description ON core_package BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+]
+
+POSTGRES_INDEX = (
+    f'CREATE INDEX IF NOT EXISTS core_package_search_idx ON core_package USING GIN (({PG_SEARCH_VECTOR}))'
+)
+
+
+SEARCH_MIGRATION = ('core', '0002_package_search_index')
+
+
+def ensure_search_index(using='default', **kwargs):
+    """post_migrate hook: keep the search index that migration 0002 owns intact.
+
+    With migrations, it only reinstalls SQLite triggers that a rebuild of
+    core_package dropped, and never recreates an index 0002 did not leave in
+    place (so migrating back past 0002 sticks). Without migrations (the test
+    settings) nothing else creates the index, so it is built here.
+    """
+    conn = connections[using]
+    tables = conn.introspection.table_names()
+    if 'core_package' not in tables:
+        return
+    module_name, _ = MigrationLoader.migrations_module('core')
+    if module_name is not None:
+        if SEARCH_MIGRATION not in MigrationRecorder(conn).applied_migrations():
+            return
+        if conn.vendor == 'sqlite' and FTS_TABLE in tables:
+            with conn.cursor() as cursor:
+                for statement in SQLITE_TRIGGERS:
+                    cursor.execute(statement)
+        return
+
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute(SQLITE_FTS_TABLE)
+            for statement in SQLITE_TRIGGERS:
+                cursor.execute(statement)
+            if FTS_TABLE not in tables:
+                cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+        elif conn.vendor == 'postgresql':
+            cursor.execute(POSTGRES_INDEX)
+
+
+def build_fts_query(query):
+    """Turn free text into a safe FTS5 MATCH expression (prefix AND match)"""
+    tokens = _TOKEN_RE.findall(query or '')
+    return ' '.join(f'"{token}"*' for token in tokens)
+
+
+class _SQLiteRankedSearch:
+    """Lazy, sliceable result set so Django's Paginator can drive FTS5 queries"""
+
+    def __init__(self, match, filters, params):
+        self.match = match
+        self.filters = filters
+        self.params = params
+        self._count = None
+
+    def _where(self):
+        clauses = [f'{FTS_TABLE} MATCH %s'] + self.filters
+        return ' AND '.join(clauses)
+
+    def count(self):
+        if self._count is None:
+            sql = (
+                f'SELECT COUNT(*) FROM {FTS_TABLE} '
+                f'JOIN core_package ON core_package.id = {FTS_TABLE}.rowid '
+                f'WHERE {self._where()}'
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(sql, [self.match] + self.params)
+                self._count = cursor.fetchone()[0]
+        return self._count
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index:index + 1][0]
+        start = index.start or 0
+        limit = (index.stop - start) if index.stop is not None else -1
+        # Title matches weigh ten times more than description matches.
+        sql = (
+            f'SELECT core_package.*, bm25({FTS_TABLE}, 10.0, 1.0) AS rank '
+            f'FROM {FTS_TABLE} '
+            f'JOIN core_package ON core_package.id = {FTS_TABLE}.rowid '
+            f'WHERE {self._where()} '
+            # Same tie-breaker as the Postgres path, so equal ranks page stably.
+            'ORDER BY rank, core_package.id DESC LIMIT %s OFFSET %s'
+        )
+        return list(Package.objects.raw(sql, [self.match] + self.params + [limit, start]))
+
+
+def _sqlite_search(query, min_price, max_price, active_only):
+    match = build_fts_query(query)
+    if not match:
+        return Package.objects.none()
+
+    filters, params = [], []
+    if active_only:
+        filters.append('core_package.is_active = %s')
+        params.append(True)
+    if min_price is not None:
+        filters.append('core_package.price >= %s')
+        params.append(str(min_price))
+    if max_price is not None:
+        filters.append('core_package.price <= %s')
+        params.append(str(max_price))
+    return _SQLiteRankedSearch(match, filters, params)
+
+
+def _filtered(queryset, min_price, max_price, active_only):
+    if active_only:
+        queryset = queryset.filter(is_active=True)
+    if min_price is not None:
+        queryset = queryset.filter(price__gte=min_price)
+    if max_price is not None:
+        queryset = queryset.filter(price__lte=max_price)
+    return queryset
+
+
+def _postgres_search(query, min_price, max_price, active_only):
+    tsquery = f"websearch_to_tsquery('{PG_SEARCH_CONFIG}', %s)"
+    # Both expressions reuse PG_SEARCH_VECTOR verbatim so the GIN index applies.
+    queryset = Package.objects.filter(
+        RawSQL(f'{PG_SEARCH_VECTOR} @@ {tsquery}', (query,), output_field=BooleanField())
+    ).annotate(
+        rank=RawSQL(f'ts_rank_cd({PG_SEARCH_VECTOR}, {tsquery})', (query,), output_field=FloatField())
+    )
+    queryset = _filtered(queryset, min_price, max_price, active_only)
+    return queryset.order_by('-rank', '-id')
+
+
+def _fallback_search(query, min_price, max_price, active_only):
+    queryset = Package.objects.filter(
+        Q(title__icontains=query) | Q(description__icontains=query)
+    )
+    queryset = _filtered(queryset, min_price, max_price, active_only)
+    return queryset.order_by('-created_at')
+
+
+def search_packages(query, min_price=None, max_price=None, active_only=True, page=1, per_page=20):
+    """Search packages by title/description and return a ranked Page"""
+    query = (query or '').strip()
+    if not query:
+        results = Package.objects.none()
+    elif connection.vendor == 'sqlite':
+        results = _sqlite_search(query, min_price, max_price, active_only)
+    elif connection.vendor == 'postgresql':
+        results = _postgres_search(query, min_price, max_price, active_only)
+    else:
+        results = _fallback_search(query, min_price, max_price, active_only)
+
+    return Paginator(results, per_page).get_page(page)
@@ -0,0 +1,38 @@
+import time
+from importlib import import_module
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+DB_BACKED_ENGINES = (
+    'django.contrib.sessions.backends.db',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def purge_expired_sessions(batch_size=None, pause=0):
+    """Delete expired django_session rows in bounded batches.
+
+    Unlike `clearsessions`, no single DELETE touches more than `batch_size`
+    rows, so the table is never locked for long. Returns the number deleted.
+    """
+    if settings.SESSION_ENGINE not in DB_BACKED_ENGINES:
+        # Cache and cookie sessions expire on their own.
+        import_module(settings.SESSION_ENGINE).SessionStore.clear_expired()
+        return 0
+
+    batch_size = batch_size or settings.SESSION_PURGE_BATCH_SIZE
+    cutoff = timezone.now()
+    total = 0
+    while True:
+        keys = list(
+            Session.objects.filter(expire_date__lt=cutoff).values_list('pk', flat=True)[:batch_size]
+        )
+        if not keys:
+            break
+        deleted, _ = Session.objects.filter(pk__in=keys).delete()
+        total += deleted
+        if pause:
+            time.sleep(pause)
+    return total
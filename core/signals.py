@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from .calendar import bump_feed_version, bump_package_feed_version
+from .models import Booking, Package, Review
+from .popularity import bump_counters
+from .reviews import bump_vendor_ratings
+
+_counters_suspended = ContextVar('counters_suspended', default=False)
+
+# Sent once per status change batch by core.bookings (after commit), with
+# vendor_id, status and count keyword arguments.
+bookings_changed = Signal()
+
+
+@contextmanager
+def suspend_counters():
+    """Delete rows without touching denormalized counters (used when archiving)"""
+    token = _counters_suspended.set(True)
+    try:
+        yield
+    finally:
+        _counters_suspended.reset(token)
+
+
+@receiver(post_save, sender=Booking)
+def booking_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        bump_counters(instance.package_id, bookings=1)
+
+
+@receiver(post_delete, sender=Booking)
+def booking_deleted(sender, instance, **kwargs):
+    if _counters_suspended.get():
+        return
+    bump_counters(instance.package_id, bookings=-1)
+
+
+@receiver(pre_save, sender=Review)
+def review_rating_changing(sender, instance, raw=False, **kwargs):
+    instance._previous_rating = None
+    if not raw and not instance._state.adding and instance.pk:
+        instance._previous_rating = (
+            Review.objects.filter(pk=instance.pk).values_list('rating', flat=True).first()
+        )
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        bump_counters(instance.package_id, reviews=1, rating=instance.rating)
+        bump_vendor_ratings(instance.package_id, reviews=1, rating=instance.rating)
+        return
+    previous = getattr(instance, '_previous_rating', None)
+    if previous is not None and previous != instance.rating:
+        bump_counters(instance.package_id, rating=instance.rating - previous)
+        bump_vendor_ratings(instance.package_id, rating=instance.rating - previous)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    if _counters_suspended.get():
+        return
+    bump_counters(instance.package_id, reviews=-1, rating=-instance.rating)
+    bump_vendor_ratings(instance.package_id, reviews=-1, rating=-instance.rating)
+
+
+@receiver(bookings_changed)
+def bookings_batch_changed(sender, vendor_id, **kwargs):
+    bump_feed_version(vendor_id)
+
+
+@receiver(post_save, sender=Booking)
+@receiver(post_delete, sender=Booking)
+def booking_calendar_changed(sender, instance, raw=False, **kwargs):
+    # Archived bookings are long past, so they never appear in a feed window.
+    if raw or _counters_suspended.get():
+        return
+    bump_package_feed_version(instance.package_id)
+
+
+@receiver(post_save, sender=Package)
+def package_calendar_changed(sender, instance, raw=False, **kwargs):
+    if not raw:
+        bump_feed_version(instance.vendor_id)
@@ -0,0 +1,68 @@
+import gzip
+import re
+
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.files.base import ContentFile
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; gzip variants are always built
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.txt', '.json', '.map', '.xml', '.html')
+MIN_COMPRESS_SIZE = 256
+
+_CSS_STRING_RE = re.compile(r'''("(?:\\.|[^"\\])*"|'(?:\\.|[^'\\])*')''')
+_CSS_COMMENT_RE = re.compile(r'/\*.*?\*/', re.DOTALL)
+_CSS_SPACE_RE = re.compile(r'\s+')
+_CSS_PUNCT_RE = re.compile(r'\s*([{};,>])\s*')
+_CSS_COLON_RE = re.compile(r':\s+')
+
+
+def minify_css(css):
+    """Strip comments and redundant whitespace, leaving string literals intact"""
+    parts = _CSS_STRING_RE.split(_CSS_COMMENT_RE.sub('', css))
+    for index in range(0, len(parts), 2):
+        chunk = _CSS_SPACE_RE.sub(' ', parts[index])
+        chunk = _CSS_PUNCT_RE.sub(r'\1', chunk)
+        parts[index] = _CSS_COLON_RE.sub(':', chunk).replace(';}', '}')
+    return ''.join(parts).strip()
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Hashed filenames plus minified CSS and .gz/.br siblings, built at collectstatic.
+
+    core.middleware.StaticFilesMiddleware serves the precompressed variants.
+    """
+
+    def post_process(self, paths, dry_run=False, **options):
+        yield from super().post_process(paths, dry_run=dry_run, **options)
+        if dry_run:
+            return
+
+        for name in sorted(set(self.hashed_files.values())):
+            if name.endswith('.css'):
+                self._rewrite(name, minify_css(self._read(name).decode()).encode())
+        for name in sorted(set(paths) | set(self.hashed_files.values())):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS):
+                self._compress(name)
+
+    def _read(self, name):
+        with self.open(name) as fh:
+            return fh.read()
+
+    def _rewrite(self, name, content):
+        self.delete(name)
+        self._save(name, ContentFile(content))
+
+    def _compress(self, name):
+        content = self._read(name)
+        if len(content) < MIN_COMPRESS_SIZE:
+            return
+        variants = [('.gz', gzip.compress(content, compresslevel=9, mtime=0))]
+        if brotli is not None:
+            variants.append(('.br', brotli.compress(content)))
+        for suffix, compressed in variants:
+            # Only keep variants that actually save bytes.
+            if len(compressed) < len(content):
+                self._rewrite(name + suffix, compressed)
@@ -1,3 +1,555 @@
-from django.test import TestCase
+import gzip
+import json
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+from unittest import mock, skipIf
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.contrib.sessions.models import Session
+from django.core.paginator import EmptyPage
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import User, VendorProfile
+from .archive import archive_bookings, archive_reviews
+from .availability import PackageUnavailable, check_availability, release, reserve
+from .calendar import feed_token, rotate_feed_token
+from .checks import check_shared_cache
+from .bookings import InvalidTransition, bulk_transition, transition
+from .middleware import DEFAULT_CACHE_CONTROL, IMMUTABLE_CACHE_CONTROL, CompressionMiddleware, brotli
+from .models import Booking, Package, PackageInventory, Review
+from .paginator import EstimatedCountPaginator
+from .popularity import PRIOR_RATING, rebuild_counters, top_packages
+from .reviews import ReviewRejected, submit_review
+from .search import FTS_TABLE, SEARCH_MIGRATION, ensure_search_index, search_packages
+from .sessions import purge_expired_sessions
+
+
+class PackageFixtureMixin:
+    @classmethod
+    def setUpTestData(cls):
+        cls.vendor = User.objects.create_user(
+            username='vendor', email='vendor@example.com', password='secret', user_type='vendor',
+        )
+        cls.traveler = User.objects.create_user(
+            username='traveler', email='traveler@example.com', password='secret', user_type='traveler',
+        )
+        cls.package = Package.objects.create(
+            vendor=cls.vendor, title='Annapurna Base Camp', price=100, capacity=3,
+        )
+        cls.start = date(2030, 5, 1)
+        cls.end = cls.start + timedelta(days=1)
+
+    def reserved(self, package=None):
+        return list(
+            PackageInventory.objects.filter(package=package or self.package)
+            .order_by('date')
+            .values_list('reserved', flat=True)
+        )
+
+
+class AvailabilityTests(PackageFixtureMixin, TestCase):
+    def test_reserve_takes_seats_on_every_day(self):
+        booking = reserve(self.package, self.start, self.end, self.traveler, seats=2)
+
+        self.assertEqual(booking.reserved_seats, 2)
+        self.assertEqual(booking.total_price, 200)
+        self.assertEqual(self.reserved(), [2, 2])
+
+    def test_release_gives_back_the_reserved_seats(self):
+        booking = reserve(self.package, self.start, self.end, self.traveler, seats=3)
+
+        release(self.package.pk, self.start, self.end, booking.reserved_seats)
+
+        self.assertEqual(self.reserved(), [0, 0])
+        self.assertTrue(check_availability(self.package, self.start, self.end, seats=3))
+
+    def test_release_of_nothing_is_a_no_op(self):
+        reserve(self.package, self.start, self.end, self.traveler, seats=1)
+
+        self.assertEqual(release(self.package.pk, self.start, self.end, 0), 0)
+        self.assertEqual(self.reserved(), [1, 1])
+
+    def test_full_capacity_rejects_and_takes_nothing(self):
+        reserve(self.package, self.start, self.start, self.traveler, seats=3)
+
+        self.assertFalse(check_availability(self.package, self.start, self.end))
+        with self.assertRaises(PackageUnavailable):
+            reserve(self.package, self.start, self.end, self.traveler)
+        # Nothing was taken on the second day, which still had room.
+        self.assertEqual(self.reserved(), [3])
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_more_seats_than_capacity(self):
+        self.assertFalse(check_availability(self.package, self.start, self.end, seats=4))
+        with self.assertRaises(PackageUnavailable):
+            reserve(self.package, self.start, self.end, self.traveler, seats=4)
+
+    def test_unlimited_package_holds_no_inventory(self):
+        package = Package.objects.create(vendor=self.vendor, title='City Walk', price=10)
+
+        booking = reserve(package, self.start, self.end, self.traveler, seats=5)
+
+        self.assertEqual(booking.reserved_seats, 0)
+        self.assertEqual(self.reserved(package), [])
+
+
+class BookingTransitionTests(PackageFixtureMixin, TestCase):
+    def book(self, **kwargs):
+        kwargs.setdefault('package', self.package)
+        return Booking.objects.create(
+            traveler=self.traveler, start_date=self.start, end_date=self.end, total_price=100, **kwargs,
+        )
+
+    def test_cancel_releases_the_reserved_seats(self):
+        booking = reserve(self.package, self.start, self.end, self.traveler, seats=3)
+
+        self.assertTrue(transition(booking, 'cancelled'))
+
+        self.assertEqual(self.reserved(), [0, 0])
+        booking.refresh_from_db()
+        self.assertEqual((booking.status, booking.reserved_seats), ('cancelled', 0))
+
+    def test_cancel_without_reservation_keeps_other_seats(self):
+        reserve(self.package, self.start, self.end, self.traveler, seats=2)
+        walk_in = self.book()
+
+        self.assertTrue(transition(walk_in, 'cancelled'))
+
+        self.assertEqual(self.reserved(), [2, 2])
+
+    def test_stale_expected_status_loses_the_race(self):
+        booking = self.book()
+        stale = Booking.objects.get(pk=booking.pk)
+        self.assertTrue(transition(booking, 'confirmed'))
+
+        self.assertFalse(transition(stale, 'cancelled', expected='pending'))
+
+        booking.refresh_from_db()
+        self.assertEqual(booking.status, 'confirmed')
+        self.assertEqual(stale.status, 'pending')
+
+    def test_invalid_transition(self):
+        booking = self.book(status='cancelled')
+        with self.assertRaises(InvalidTransition):
+            transition(booking, 'confirmed')
+
+    def test_bulk_confirm_is_one_update(self):
+        bookings = [self.book() for _ in range(5)]
+        self.book(status='cancelled')
+        other = Package.objects.create(vendor=self.traveler, title='Not ours', price=1)
+        foreign = self.book(package=other)
+
+        # One UPDATE, inside the transaction's savepoint pair.
+        with self.assertNumQueries(3):
+            moved = bulk_transition(self.vendor, [b.pk for b in bookings] + [foreign.pk], 'confirmed')
+
+        self.assertEqual(moved, 5)
+        self.assertEqual(Booking.objects.filter(status='confirmed').count(), 5)
+        foreign.refresh_from_db()
+        self.assertEqual(foreign.status, 'pending')
+
+    def test_bulk_cancel_releases_each_bookings_seats(self):
+        first = reserve(self.package, self.start, self.end, self.traveler, seats=1)
+        second = reserve(self.package, self.end, self.end + timedelta(days=1), self.traveler, seats=2)
+        kept = reserve(self.package, self.start, self.start, self.traveler, seats=1)
+        walk_in = self.book()
+        self.assertEqual(self.reserved(), [2, 3, 2])
+
+        # Lock, inventory UPDATE and booking UPDATE, plus the savepoint pair.
+        with self.assertNumQueries(5):
+            moved = bulk_transition(self.vendor, [first.pk, second.pk, walk_in.pk], 'cancelled')
+
+        self.assertEqual(moved, 3)
+        self.assertEqual(self.reserved(), [1, 0, 0])
+        kept.refresh_from_db()
+        self.assertEqual((kept.status, kept.reserved_seats), ('pending', 1))
+
+
+class PopularityTests(PackageFixtureMixin, TestCase):
+    def test_new_package_starts_at_the_prior_and_rebuild_keeps_it(self):
+        package = Package.objects.create(vendor=self.vendor, title='Everest View', price=50)
+        self.assertEqual(package.popularity, PRIOR_RATING)
+
+        rebuild_counters()
+
+        package.refresh_from_db()
+        self.assertEqual(package.popularity, PRIOR_RATING)
+
+    def test_vendor_ranking_can_include_inactive_packages(self):
+        hidden = Package.objects.create(vendor=self.vendor, title='Retired Trek', price=50, is_active=False)
+
+        self.assertEqual(list(top_packages(vendor=self.vendor)), [self.package])
+        self.assertCountEqual(top_packages(vendor=self.vendor, include_inactive=True), [self.package, hidden])
+
+
+class BookingAdminTests(PackageFixtureMixin, TestCase):
+    def setUp(self):
+        admin_user = User.objects.create_superuser(username='admin', email='admin@example.com', password='secret')
+        self.client.force_login(admin_user)
+
+    def add(self, seats):
+        return self.client.post(reverse('admin:core_booking_add'), {
+            'package': self.package.pk, 'traveler': self.traveler.pk, 'status': 'pending', 'source': 'direct',
+            'start_date': self.start, 'end_date': self.end, 'total_price': 100, 'seats': seats,
+        })
+
+    def test_add_holds_the_requested_seats(self):
+        self.assertEqual(self.add(seats=2).status_code, 302)
+
+        self.assertEqual(Booking.objects.get().reserved_seats, 2)
+        self.assertEqual(self.reserved(), [2, 2])
+
+    def test_full_package_is_a_form_error(self):
+        reserve(self.package, self.start, self.start, self.traveler, seats=3)
+
+        self.assertContains(self.add(seats=1), 'fully booked')
+        self.assertEqual(Booking.objects.count(), 1)
+
+    def test_seats_lost_after_validation_are_reported_not_a_500(self):
+        reserve(self.package, self.start, self.start, self.traveler, seats=3)
+
+        # Validation still saw a free seat; someone else took it before the save.
+        with mock.patch('core.admin.check_availability', return_value=True):
+            response = self.add(seats=1)
+
+        self.assertRedirects(response, reverse('admin:core_booking_add'), fetch_redirect_response=False)
+        self.assertEqual(
+            [str(message) for message in get_messages(response.wsgi_request)],
+            [f'The booking was not saved: {self.package} is fully booked for the selected dates.'],
+        )
+        # The whole add was rolled back, including the second day's inventory row.
+        self.assertEqual(Booking.objects.count(), 1)
+        self.assertEqual(self.reserved(), [3])
+
+
+class ArchiveCounterTests(PackageFixtureMixin, TestCase):
+    def test_rebuild_counts_archived_rows(self):
+        long_ago = timezone.now() - timedelta(days=800)
+        Booking.objects.create(
+            package=self.package, traveler=self.traveler, total_price=100,
+            start_date=long_ago.date(), end_date=long_ago.date(),
+        )
+        Booking.objects.create(
+            package=self.package, traveler=self.traveler, total_price=100,
+            start_date=self.start, end_date=self.end,
+        )
+        Review.objects.create(package=self.package, traveler=self.traveler, rating=4)
+        Review.objects.update(created_at=long_ago)
+        self.assertEqual((archive_bookings(), archive_reviews()), (1, 1))
+
+        rebuild_counters()
+
+        self.package.refresh_from_db()
+        self.assertEqual(
+            (self.package.booking_count, self.package.review_count, self.package.rating_sum),
+            (2, 1, 4),
+        )
+
+
+class ReviewSubmissionTests(PackageFixtureMixin, TestCase):
+    comment = 'The guides were friendly and the lodges were warm'
+
+    def test_submit_updates_package_and_vendor_counters(self):
+        profile = VendorProfile.objects.create(user=self.vendor, business_name='Treks', owner_name='Owner')
+
+        submit_review(self.traveler, self.package, '4', self.comment)
+
+        self.package.refresh_from_db()
+        profile.refresh_from_db()
+        self.assertEqual((self.package.review_count, self.package.rating_sum), (1, 4))
+        self.assertEqual((profile.review_count, profile.rating_sum), (1, 4))
+        self.assertEqual(self.package.avg_rating, 4)
+
+    def test_second_review_of_same_package_is_rejected(self):
+        submit_review(self.traveler, self.package, 5)
+
+        with self.assertRaisesMessage(ReviewRejected, 'already reviewed'):
+            submit_review(self.traveler, self.package, 1)
+        self.package.refresh_from_db()
+        self.assertEqual((self.package.review_count, self.package.rating_sum), (1, 5))
+
+    def test_archived_review_still_counts_as_reviewed(self):
+        submit_review(self.traveler, self.package, 5)
+        Review.objects.update(created_at=timezone.now() - timedelta(days=800))
+        archive_reviews()
+
+        with self.assertRaisesMessage(ReviewRejected, 'already reviewed'):
+            submit_review(self.traveler, self.package, 1)
+
+    def test_recent_duplicate_comment_is_rejected(self):
+        other = Package.objects.create(vendor=self.vendor, title='Everest View', price=50)
+        submit_review(self.traveler, self.package, 5, self.comment)
+
+        # Same words, different case, order and punctuation.
+        with self.assertRaisesMessage(ReviewRejected, 'duplicates'):
+            submit_review(self.traveler, other, 5, 'Warm lodges; the guides were FRIENDLY and the...')
+
+    def test_short_comments_are_not_fingerprinted(self):
+        other = Package.objects.create(vendor=self.vendor, title='Everest View', price=50)
+        submit_review(self.traveler, self.package, 5, 'Great trip!')
+
+        review = submit_review(self.traveler, other, 5, 'Great trip!')
+
+        self.assertEqual(review.comment_fingerprint, '')
+
+    def test_invalid_ratings_are_rejected(self):
+        for rating in ('abc', None, 0, 6):
+            with self.subTest(rating=rating), self.assertRaises(ReviewRejected):
+                submit_review(self.traveler, self.package, rating)
+        self.assertFalse(Review.objects.exists())
+
+
+class SearchViewTests(PackageFixtureMixin, TestCase):
+    def test_non_finite_prices_are_ignored(self):
+        for params in ('min_price=NaN', 'max_price=Infinity', 'min_price=-Infinity', 'max_price=sNaN'):
+            with self.subTest(params=params):
+                response = self.client.get(f'/search/?q=annapurna&{params}')
+                self.assertContains(response, 'Annapurna Base Camp')
+
+
+class SearchRankingTests(PackageFixtureMixin, TestCase):
+    def test_equal_ranks_page_newest_first_without_repeats(self):
+        packages = [
+            Package.objects.create(vendor=self.vendor, title='Langtang Trek', price=50) for _ in range(5)
+        ]
+
+        seen = [
+            package.pk
+            for page in range(1, 4)
+            for package in search_packages('langtang', page=page, per_page=2).object_list
+        ]
+
+        self.assertEqual(seen, [package.pk for package in reversed(packages)])
+
+
+@skipIf(connection.vendor != 'sqlite', 'exercises the SQLite FTS5 index')
+class SearchIndexHookTests(PackageFixtureMixin, TestCase):
+    index = {FTS_TABLE, 'core_package_fts_ai', 'core_package_fts_ad', 'core_package_fts_au'}
+
+    def installed(self):
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT name FROM sqlite_master')
+            return self.index & {name for name, in cursor.fetchall()}
+
+    def drop(self, *names):
+        with connection.cursor() as cursor:
+            for name in names:
+                cursor.execute(f"DROP {'TABLE' if name == FTS_TABLE else 'TRIGGER'} {name}")
+
+    def migrated(self, applied):
+        """Run the hook as on a migrated database with the given core migrations applied"""
+        recorded = {migration: None for migration in applied}
+        with override_settings(MIGRATION_MODULES={'core': 'core.migrations'}), \
+                mock.patch('core.search.MigrationRecorder.applied_migrations', return_value=recorded):
+            ensure_search_index()
+
+    def test_without_migrations_the_index_is_built_and_filled(self):
+        self.drop(*sorted(self.index - {FTS_TABLE}), FTS_TABLE)
+
+        with override_settings(MIGRATION_MODULES={'core': None}):
+            ensure_search_index()
+
+        self.assertEqual(self.installed(), self.index)
+        self.assertEqual(list(search_packages('annapurna').object_list), [self.package])
+
+    def test_migrated_back_past_0002_stays_without_an_index(self):
+        self.drop(*sorted(self.index - {FTS_TABLE}), FTS_TABLE)
+
+        self.migrated(applied=[('core', '0001_initial')])
+
+        self.assertEqual(self.installed(), set())
+
+    def test_triggers_dropped_by_a_table_rebuild_are_reinstalled(self):
+        self.drop('core_package_fts_ai')
+
+        self.migrated(applied=[('core', '0001_initial'), SEARCH_MIGRATION])
+
+        self.assertEqual(self.installed(), self.index)
+        Package.objects.create(vendor=self.vendor, title='Langtang Trek', price=10)
+        self.assertEqual(len(search_packages('langtang').object_list), 1)
+
+
+class CalendarFeedTests(PackageFixtureMixin, TestCase):
+    def test_unchanged_feed_is_not_modified_until_bookings_change(self):
+        start = timezone.now().date() + timedelta(days=3)
+        booking = Booking.objects.create(
+            package=self.package, traveler=self.traveler, start_date=start, end_date=start, total_price=100,
+        )
+        url = reverse('booking_calendar', args=[feed_token(self.vendor)])
+        response = self.client.get(url)
+        self.assertContains(response, 'SUMMARY:Annapurna Base Camp (pending)')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_transition(self.vendor, [booking.pk], 'confirmed')
+        self.assertContains(self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag']), 'STATUS:CONFIRMED')
+
+    def test_long_lines_are_folded_at_75_octets(self):
+        title = 'Trek through the Khumbu valley to Everest Base Camp and Kala Patthar — शुभ यात्रा'
+        Package.objects.filter(pk=self.package.pk).update(title=title)
+        start = timezone.now().date() + timedelta(days=3)
+        Booking.objects.create(
+            package=self.package, traveler=self.traveler, start_date=start, end_date=start, total_price=100,
+        )
+
+        content = self.client.get(reverse('booking_calendar', args=[feed_token(self.vendor)])).content
+
+        lines = content.split(b'\r\n')
+        self.assertLessEqual(max(len(line) for line in lines), 75)
+        unfolded = content.replace(b'\r\n ', b'').decode()
+        self.assertIn(f'SUMMARY:{title} (pending)\r\n', unfolded)
+
+    def test_rotating_the_token_revokes_the_old_url(self):
+        old_url = reverse('booking_calendar', args=[feed_token(self.vendor)])
+
+        new_url = reverse('booking_calendar', args=[rotate_feed_token(self.vendor)])
+
+        self.assertEqual(self.client.get(old_url).status_code, 404)
+        self.assertEqual(self.client.get(new_url).status_code, 200)
+
+
+class EstimatedCountPaginatorTests(PackageFixtureMixin, TestCase):
+    def paginator(self):
+        for n in range(2):
+            Package.objects.create(vendor=self.vendor, title=f'Trek {n}', price=10)
+        return EstimatedCountPaginator(Package.objects.order_by('pk'), 2)
+
+    def test_sqlite_counts_exactly(self):
+        paginator = self.paginator()
+
+        self.assertEqual(paginator.count, 3)
+        self.assertFalse(paginator.estimated)
+
+    def test_overshooting_estimate_falls_back_to_the_exact_count(self):
+        paginator = self.paginator()
+        with mock.patch('core.paginator.estimate_row_count', return_value=20000):
+            self.assertEqual(paginator.count, 20000)
+
+        self.assertEqual(len(paginator.page(2)), 1)
+        with self.assertRaises(EmptyPage):
+            paginator.page(50)
+        self.assertEqual((paginator.count, paginator.num_pages, paginator.estimated), (3, 2, False))
+
+
+@override_settings(SESSION_ENGINE='django.contrib.sessions.backends.db')
+class SessionPurgeTests(TestCase):
+    def test_expired_sessions_are_purged_in_batches(self):
+        now = timezone.now()
+        for n in range(5):
+            Session.objects.create(session_key=f'expired{n}', session_data='', expire_date=now - timedelta(days=1))
+        Session.objects.create(session_key='live', session_data='', expire_date=now + timedelta(days=1))
+
+        # One SELECT and one DELETE per batch of two, plus the SELECT that finds nothing left.
+        with self.assertNumQueries(7):
+            self.assertEqual(purge_expired_sessions(batch_size=2), 5)
+
+        self.assertEqual(list(Session.objects.values_list('session_key', flat=True)), ['live'])
+
+
+class SharedCacheCheckTests(TestCase):
+    cache_sessions = 'django.contrib.sessions.backends.cached_db'
+    redis = {'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://cache'}}
+
+    def warnings(self, **overrides):
+        with override_settings(DEBUG=False, **overrides):
+            return [warning.id for warning in check_shared_cache(None)]
+
+    def test_cache_sessions_in_a_process_local_cache_warn(self):
+        self.assertEqual(self.warnings(SESSION_ENGINE=self.cache_sessions), ['core.W001'])
+
+    def test_db_sessions_or_a_shared_cache_are_fine(self):
+        self.assertEqual(self.warnings(SESSION_ENGINE='django.contrib.sessions.backends.db'), [])
+        self.assertEqual(self.warnings(SESSION_ENGINE=self.cache_sessions, CACHES=self.redis), [])
+
+
+class CompressionMiddlewareTests(TestCase):
+    html = b'<html><body>' + b'<p>Namaste Nomad</p>' * 50 + b'</body></html>'
+
+    def compress(self, response, accept_encoding='gzip, br', **meta):
+        request = RequestFactory().get('/', HTTP_ACCEPT_ENCODING=accept_encoding, **meta)
+        return CompressionMiddleware(lambda request: response)(request)
+
+    @skipIf(brotli is None, 'brotli is not installed')
+    def test_html_is_brotli_compressed_with_a_random_length_comment(self):
+        with mock.patch('core.middleware.secrets.randbelow', return_value=40):
+            response = self.compress(HttpResponse(self.html))
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        body = brotli.decompress(response.content)
+        self.assertTrue(body.startswith(self.html))
+        self.assertRegex(body[len(self.html):], rb'^<!-- [\w-]{54} -->$')
+
+    @skipIf(brotli is None, 'brotli is not installed')
+    def test_streamed_html_is_compressed_chunk_by_chunk(self):
+        response = self.compress(StreamingHttpResponse(iter([self.html[:300], self.html[300:]])))
+
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertTrue(brotli.decompress(b''.join(response.streaming_content)).startswith(self.html))
+
+    def test_non_html_carrying_a_csrf_token_falls_back_to_gzip(self):
+        response = self.compress(
+            HttpResponse(self.html, content_type='application/json'), CSRF_COOKIE_NEEDS_UPDATE=True,
+        )
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(gzip.decompress(response.content), self.html)
+
+    def test_gzip_when_brotli_is_not_accepted(self):
+        response = self.compress(HttpResponse(self.html), accept_encoding='gzip')
+
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+
+    def test_small_and_binary_bodies_are_left_alone(self):
+        for response in (HttpResponse(b'<p>hi</p>'), HttpResponse(self.html, content_type='image/png')):
+            with self.subTest(content_type=response['Content-Type']):
+                self.assertFalse(self.compress(response).has_header('Content-Encoding'))
+
+
+class StaticFilesMiddlewareTests(TestCase):
+    hashed = 'css/site.0123456789ab.css'
+
+    def setUp(self):
+        root = Path(self.enterContext(tempfile.TemporaryDirectory()))
+        (root / 'css').mkdir()
+        for name in ('css/site.css', self.hashed, 'css/vendor.fedcba987654.css'):
+            (root / name).write_text('body{color:red}')
+        (root / f'{self.hashed}.gz').write_bytes(b'gzipped')
+        (root / 'staticfiles.json').write_text(
+            json.dumps({'version': '1.1', 'paths': {'css/site.css': self.hashed}})
+        )
+        # Overriding STORAGES too makes the storage reload its manifest from the new root.
+        storages = {
+            **settings.STORAGES,
+            'staticfiles': {'BACKEND': 'core.storage.CompressedManifestStaticFilesStorage'},
+        }
+        self.enterContext(override_settings(STATIC_ROOT=str(root), STORAGES=storages))
+
+    def get(self, name, **headers):
+        return self.client.get(f'/static/{name}', headers=headers)
+
+    def test_manifest_names_are_immutable_and_precompressed(self):
+        response = self.get(self.hashed, accept_encoding='gzip, deflate')
+
+        self.assertEqual(response['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(b''.join(response.streaming_content), b'gzipped')
+
+    def test_names_outside_the_manifest_are_revalidated(self):
+        # Looks hashed, but the manifest is the source of truth once loaded.
+        for name in ('css/site.css', 'css/vendor.fedcba987654.css'):
+            with self.subTest(name=name):
+                self.assertEqual(self.get(name)['Cache-Control'], DEFAULT_CACHE_CONTROL)
+
+    def test_matching_etag_is_not_modified(self):
+        etag = self.get(self.hashed)['ETag']
+
+        self.assertEqual(self.get(self.hashed, if_none_match=etag).status_code, 304)
@@ -6,4 +6,6 @@ urlpatterns = [
     path('', views.home, name='home'),
     path('about/', views.about, name='about'),
     path('contact/', views.contact, name='contact'),
-]
\ No newline at end of file
+    path('search/', views.search, name='search'),
+    path('calendar/<str:token>/bookings.ics', views.booking_calendar, name='booking_calendar'),
+]
@@ -1,5 +1,52 @@
 # core/views.py
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.http import Http404, HttpResponse
 from django.shortcuts import render
+from django.views.decorators.http import condition
+
+from .calendar import feed_for_token, feed_window, render_ics, upcoming_bookings
+from .search import search_packages
+
+
+def _parse_price(value):
+    try:
+        price = Decimal(value)
+    except (InvalidOperation, TypeError):
+        return None
+    # NaN and Infinity parse fine but can't be compared or bound as a price.
+    if not price.is_finite() or price < 0:
+        return None
+    return price
+
+
+def _calendar_window(request):
+    try:
+        start = date.fromisoformat(request.GET['start'])
+    except (KeyError, ValueError):
+        start = None
+    try:
+        days = int(request.GET['days'])
+    except (KeyError, ValueError):
+        days = None
+    return feed_window(start, days)
+
+
+def _calendar_feed(request, token):
+    # Looked up once per request: both the ETag check and the view need it.
+    if not hasattr(request, '_calendar_feed'):
+        request._calendar_feed = feed_for_token(token)
+    return request._calendar_feed
+
+
+def _calendar_etag(request, token):
+    feed = _calendar_feed(request, token)
+    if feed is None:
+        return None
+    start, end = _calendar_window(request)
+    return f'{feed["vendor_id"]}-{feed["version"]}-{start:%Y%m%d}-{end:%Y%m%d}'
+
 
 def home(request):
     """Landing page"""
@@ -11,4 +58,38 @@ def about(request):
 
 def contact(request):
     """Contact page"""
-    return render(request, 'core/contact.html')
\ No newline at end of file
+    return render(request, 'core/contact.html')
+
+def search(request):
+    """Traveler-facing package search"""
+    query = request.GET.get('q', '')
+    min_price = _parse_price(request.GET.get('min_price'))
+    max_price = _parse_price(request.GET.get('max_price'))
+    page_obj = search_packages(
+        query,
+        min_price=min_price,
+        max_price=max_price,
+        page=request.GET.get('page'),
+    )
+    return render(request, 'core/search.html', {
+        'query': query,
+        'min_price': min_price,
+        'max_price': max_price,
+        'page_obj': page_obj,
+    })
+
+
+@condition(etag_func=_calendar_etag)
+def booking_calendar(request, token):
+    """ICS feed of a vendor's upcoming bookings; unchanged polls get a 304 after one lookup"""
+    feed = _calendar_feed(request, token)
+    if feed is None:
+        raise Http404('Unknown calendar feed')
+    vendor_id = feed['vendor_id']
+    start, end = _calendar_window(request)
+    response = HttpResponse(
+        render_ics(upcoming_bookings(vendor_id, start, end), vendor_id),
+        content_type='text/calendar; charset=utf-8',
+    )
+    response['Cache-Control'] = 'private, max-age=300'
+    return response
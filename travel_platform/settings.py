@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -20,16 +21,23 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/4.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = 'django-insecure-4wi^6v#xkt8-6@$q2d&#14ta_f9#v%d9%0h47!u67h(p8s^&nf'
+SECRET_KEY = os.environ.get(
+    'DJANGO_SECRET_KEY',
+    'django-insecure-4wi^6v#xkt8-6@$q2d&#14ta_f9#v%d9%0h47!u67h(p8s^&nf',
+)
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = os.environ.get('DJANGO_DEBUG', '1') == '1'
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = [host for host in os.environ.get('DJANGO_ALLOWED_HOSTS', '').split(',') if host]
 
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
+# Serves request.user (with its vendor profile) from the cache.
+AUTHENTICATION_BACKENDS = ['accounts.backends.CachedModelBackend']
+AUTH_USER_CACHE_TIMEOUT = 300  # seconds
+
 
 
 # Application definition
@@ -47,6 +55,8 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.middleware.StaticFilesMiddleware',
+    'core.middleware.CompressionMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -132,15 +142,93 @@ STATIC_URL = '/static/'
 STATICFILES_DIRS = [BASE_DIR / 'static']
 STATIC_ROOT = BASE_DIR / 'staticfiles'
 
+# Production builds get fingerprinted, minified and precompressed assets at
+# collectstatic time; DEBUG keeps plain names so no manifest is required.
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': os.environ.get(
+            'DJANGO_STATICFILES_STORAGE',
+            'django.contrib.staticfiles.storage.StaticFilesStorage'
+            if DEBUG else 'core.storage.CompressedManifestStaticFilesStorage',
+        ),
+    },
+}
+
 # Media files
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Uploads are streamed to temp files in chunks and hashed on the way in.
+FILE_UPLOAD_HANDLERS = ['accounts.uploads.HashingFileUploadHandler']
+FILE_UPLOAD_MAX_BYTES = 10 * 1024 * 1024  # 10MB
+
+# Run in order on the background worker after a new license is stored.
+LICENSE_POSTPROCESSORS = [
+    'accounts.uploads.scan_license',
+    'accounts.uploads.make_license_preview',
+]
+# Dotted path to a callable(file) -> bool; None disables scanning.
+LICENSE_VIRUS_SCANNER = None
+
+# Bookings that ended, and reviews written, this many days ago move to the
+# archive tables (`manage.py archive_records`).
+ARCHIVE_AFTER_DAYS = 365
+
+# core.reviews: comments this long are fingerprinted, and a fingerprint seen
+# within the window is rejected as copy-paste spam.
+REVIEW_SPAM_MIN_WORDS = 5
+REVIEW_SPAM_WINDOW_DAYS = 30
+
 
 # Static files (CSS, JavaScript, Images)
 # https://docs.djangoproject.com/en/4.2/howto/static-files/
 
-SESSION_COOKIE_AGE = 1209600  # 2 weeks in seconds
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+# Point DJANGO_CACHE_BACKEND/DJANGO_CACHE_LOCATION at a shared cache (e.g. Redis)
+# when running more than one process.
+
+CACHES = {
+    'default': {
+        'BACKEND': os.environ.get('DJANGO_CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.environ.get('DJANGO_CACHE_LOCATION', 'namaste-nomad'),
+    }
+}
+
+# State another worker must see invalidated (sessions, cached users) may only
+# live in a cache every process shares.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+SHARED_CACHE = CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES
+
+
+# Sessions
+# https://docs.djangoproject.com/en/4.2/topics/http/sessions/
+# cached_db serves reads from the cache and only touches django_session on
+# writes and cache misses; it is the default only with a shared cache, since a
+# process-local cache would keep flushed sessions alive in other workers.
+# signed_cookies removes server-side storage entirely.
+
+SESSION_ENGINES = {
+    'db': 'django.contrib.sessions.backends.db',
+    'cached_db': 'django.contrib.sessions.backends.cached_db',
+    'cache': 'django.contrib.sessions.backends.cache',
+    'signed_cookies': 'django.contrib.sessions.backends.signed_cookies',
+}
+SESSION_ENGINE = SESSION_ENGINES[
+    os.environ.get('DJANGO_SESSION_ENGINE', 'cached_db' if SHARED_CACHE else 'db')
+]
+SESSION_COOKIE_AGE = int(os.environ.get('DJANGO_SESSION_COOKIE_AGE', 1209600))  # 2 weeks in seconds
+SESSION_SAVE_EVERY_REQUEST = False
+
+# Rows deleted per statement by `manage.py purge_sessions`.
+SESSION_PURGE_BATCH_SIZE = 5000
 
 
 